@@ -0,0 +1,347 @@
+# api_server.py
+"""
+A local HTTP/JSON API over a TaskManager, so other tools can read and change tasks while the
+app runs. It only listens on 127.0.0.1. Tasks are sent in the tasks.json schema.
+
+    GET    /tasks              ?category=&include_completed=&sort_by=&q=&limit=&after=
+                               -> {"tasks": [...], "next": id to pass as after=, or null}
+    GET    /tasks/<id>
+    POST   /tasks              {"description", "category", "due_date"}  -> the new task
+    POST   /tasks/<id>/toggle  -> the task
+    DELETE /tasks/<id>
+    POST   /batch              {"ops": [{"op": "add", "description": ...},
+                                        {"op": "toggle", "id": ...}, {"op": "delete", "id": ...}]}
+                               -> {"results": [...]}, all ops applied or none
+    GET    /categories         -> {"categories": {name: number of tasks}}
+    GET    /stats              -> task and overdue counts, and how writes were grouped
+
+Reads run on a small pool of threads, so one waiting for the TaskManager (e.g. while a batch
+is saved) never holds up the event loop and the other connections. Writes go through a single
+writer: everything that arrives while it is busy is applied together in one TaskManager.batch(),
+i.e. saved with one write, so many clients writing at once cost few saves.
+"""
+import asyncio
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qs, unquote, urlsplit
+from task import parse_due_date
+from task_manager import SORT_KEYS, page_cursor
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+MAX_BODY_BYTES = 1024 * 1024
+DEFAULT_PAGE_SIZE = 100
+READ_THREADS = 4
+_REASONS = {200: "OK", 201: "Created", 204: "No Content", 400: "Bad Request", 404: "Not Found",
+            405: "Method Not Allowed", 413: "Payload Too Large", 500: "Internal Server Error"}
+
+class APIError(Exception):
+    """Turned into an error response: {"error": message} with the given HTTP status."""
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+def _parse_bool(value, name):
+    if value.lower() in ('1', 'true', 'yes'):
+        return True
+    if value.lower() in ('0', 'false', 'no'):
+        return False
+    raise APIError(400, f"'{name}' must be true or false")
+
+def _parse_add(data):
+    """Validates the fields of an add, before it reaches the writer. Returns add_task() arguments."""
+    description = data.get('description')
+    if not isinstance(description, str) or not description.strip():
+        raise APIError(400, "'description' is required")
+    category = data.get('category') or 'Uncategorized'
+    if not isinstance(category, str):
+        raise APIError(400, "'category' must be a string")
+    due_date = data.get('due_date') or None
+    if due_date is not None:
+        try:
+            parse_due_date(due_date)
+        except (TypeError, ValueError):
+            raise APIError(400, f"invalid due_date '{due_date}', expected YYYY-MM-DD") from None
+    return description, category, due_date
+
+class TaskAPIServer:
+    def __init__(self, task_manager, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        self.task_manager = task_manager
+        self.host = host
+        self.port = port # The actual port once started, if 0 was given
+        self.writes = 0 # Write requests applied
+        self.write_batches = 0 # Batches (saves) they were applied in
+        self._write_queue = None
+        self._write_executor = ThreadPoolExecutor(1, thread_name_prefix="TaskAPIWriter")
+        self._read_executor = ThreadPoolExecutor(READ_THREADS, thread_name_prefix="TaskAPIReader")
+        self._loop = None
+        self._stopped = None
+        self._thread = None
+
+    # --- Running ---
+    async def serve(self, ready=None):
+        """Serves until stop() is called. ready (a threading.Event) is set once connections are accepted."""
+        self._loop = asyncio.get_running_loop()
+        self._stopped = asyncio.Event()
+        self._write_queue = asyncio.Queue()
+        server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        self.port = server.sockets[0].getsockname()[1]
+        writer_task = asyncio.create_task(self._run_writer())
+        if ready is not None:
+            ready.set()
+        async with server:
+            await self._stopped.wait()
+        writer_task.cancel()
+        self._write_executor.shutdown()
+        self._read_executor.shutdown()
+
+    def serve_forever(self):
+        """Runs the server on this thread until interrupted (Ctrl+C)."""
+        try:
+            asyncio.run(self.serve())
+        except KeyboardInterrupt:
+            pass
+
+    def start_in_thread(self):
+        """Runs the server on a daemon thread, e.g. next to the Tk main loop. Returns once it is listening."""
+        ready = threading.Event()
+        self._thread = threading.Thread(target=lambda: asyncio.run(self.serve(ready)), name="TaskAPIServer",
+                                        daemon=True)
+        self._thread.start()
+        ready.wait()
+
+    def stop(self):
+        """Stops a server started with start_in_thread() (or serving on another thread)."""
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._stopped.set)
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    # --- HTTP ---
+    async def _handle_connection(self, reader, writer):
+        try:
+            while True: # Keep-alive: one request after another on the same connection
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+                try:
+                    method, target, version = request_line.decode('latin-1').split()
+                    length = int(headers.get('content-length', 0))
+                    if length < 0:
+                        raise ValueError(f"negative Content-Length {length}")
+                except ValueError:
+                    await self._respond(writer, 400, {"error": "malformed request"}, False)
+                    break
+                if length > MAX_BODY_BYTES:
+                    await self._respond(writer, 413, {"error": "request body too large"}, False)
+                    break
+                body = await reader.readexactly(length) if length else b''
+                try:
+                    status, payload = await self._dispatch(method, target, body)
+                except APIError as e:
+                    status, payload = e.status, {"error": str(e)}
+                except Exception as e:
+                    print(f"Warning: API request {method} {target} failed: {e}")
+                    status, payload = 500, {"error": "internal error"}
+                keep_alive = version == 'HTTP/1.1' and headers.get('connection', '').lower() != 'close'
+                await self._respond(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass # Client went away
+        finally:
+            writer.close()
+
+    async def _respond(self, writer, status, payload, keep_alive):
+        body = b'' if payload is None else json.dumps(payload).encode('utf-8')
+        head = (f"HTTP/1.1 {status} {_REASONS.get(status, '')}\r\n"
+                f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n"
+                f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+        writer.write(head.encode('latin-1') + body)
+        await writer.drain()
+
+    async def _dispatch(self, method, target, body):
+        url = urlsplit(target)
+        path = [unquote(part) for part in url.path.strip('/').split('/') if part]
+        query = {name: values[-1] for name, values in parse_qs(url.query).items()}
+        if method in ('POST', 'PUT'):
+            try:
+                data = json.loads(body) if body else {}
+            except ValueError:
+                raise APIError(400, "request body is not valid JSON") from None
+            if not isinstance(data, dict):
+                raise APIError(400, "request body must be a JSON object")
+
+        if path == ['tasks']:
+            if method == 'GET':
+                return 200, await self._read(self._list_tasks, query)
+            if method == 'POST':
+                return await self._write(self._add_operation(_parse_add(data)))
+        elif len(path) == 2 and path[0] == 'tasks':
+            if method == 'GET':
+                return 200, await self._read(self._get_task, path[1])
+            if method == 'DELETE':
+                return await self._write(self._delete_operation(path[1]))
+        elif len(path) == 3 and path[0] == 'tasks' and path[2] == 'toggle':
+            if method == 'POST':
+                return await self._write(self._toggle_operation(path[1]))
+        elif path == ['batch']:
+            if method == 'POST':
+                return await self._write(self._batch_operation(data.get('ops')))
+        elif path == ['categories']:
+            if method == 'GET':
+                return 200, {"categories": await self._read(self.task_manager.get_category_counts)}
+        elif path == ['stats']:
+            if method == 'GET':
+                return 200, await self._read(self._stats)
+        else:
+            raise APIError(404, f"no such endpoint '{url.path}'")
+        raise APIError(405, f"{method} is not supported on '{url.path}'")
+
+    # --- Reads ---
+    async def _read(self, function, *args):
+        return await self._loop.run_in_executor(self._read_executor, function, *args)
+
+    def _get_task(self, task_id):
+        task = self.task_manager.get_task(task_id)
+        if task is None:
+            raise APIError(404, f"no task with id '{task_id}'")
+        return task.to_dict()
+
+    def _list_tasks(self, query):
+        task_manager = self.task_manager
+        category = query.get('category') or None
+        include_completed = _parse_bool(query.get('include_completed', 'true'), 'include_completed')
+        sort_by = query.get('sort_by', 'created_at')
+        if sort_by not in SORT_KEYS:
+            raise APIError(400, f"'sort_by' must be one of {', '.join(SORT_KEYS)}")
+        try:
+            limit = int(query.get('limit', DEFAULT_PAGE_SIZE))
+        except ValueError:
+            raise APIError(400, "'limit' must be a number") from None
+        if limit < 1:
+            raise APIError(400, "'limit' must be at least 1")
+        after_id = query.get('after')
+
+        if query.get('q'):
+            tasks = task_manager.search(query['q'], category, include_completed, sort_by)
+            start = 0
+            if after_id:
+                start = next((i + 1 for i, task in enumerate(tasks) if task.id == after_id), None)
+                if start is None:
+                    raise APIError(400, f"'after' task '{after_id}' is not in the results")
+            page = tasks[start:start + limit]
+        else:
+            after = None
+            if after_id:
+                after_task = task_manager.get_task(after_id)
+                if after_task is None:
+                    raise APIError(400, f"no task with id '{after_id}' to continue after")
+                after = page_cursor(after_task, sort_by)
+            page = list(task_manager.iter_tasks(category, include_completed, sort_by, limit, after))
+        return {"tasks": [task.to_dict() for task in page],
+                "next": page[-1].id if len(page) == limit else None}
+
+    def _stats(self):
+        counts = self.task_manager.get_category_counts()
+        return {"tasks": sum(counts.values()),
+                "overdue": self.task_manager.overdue_count(),
+                "due_soon": self.task_manager.due_soon_count(),
+                "writes": self.writes,
+                "write_batches": self.write_batches}
+
+    # --- Writes ---
+    # Each write is an operation: a callable run by the writer inside a batch, returning (status, payload).
+    # Anything that can be checked up front is checked before it is queued.
+    def _add_operation(self, add_arguments):
+        def add():
+            task_id = self.task_manager.add_task(*add_arguments)
+            return 201, self.task_manager.get_task(task_id).to_dict()
+        return add
+
+    def _toggle_operation(self, task_id):
+        def toggle():
+            if not self.task_manager.toggle_task_status(task_id):
+                return 404, {"error": f"no task with id '{task_id}'"}
+            return 200, self.task_manager.get_task(task_id).to_dict()
+        return toggle
+
+    def _delete_operation(self, task_id):
+        def delete():
+            if not self.task_manager.delete_task(task_id):
+                return 404, {"error": f"no task with id '{task_id}'"}
+            return 204, None
+        return delete
+
+    def _batch_operation(self, ops):
+        if not isinstance(ops, list) or not ops:
+            raise APIError(400, "'ops' must be a non-empty list")
+        steps = [] # (op, add arguments or task id)
+        for index, op in enumerate(ops):
+            kind = op.get('op') if isinstance(op, dict) else None
+            if kind == 'add':
+                steps.append((kind, _parse_add(op)))
+            elif kind in ('toggle', 'delete') and isinstance(op.get('id'), str):
+                steps.append((kind, op['id']))
+            else:
+                raise APIError(400, f"op {index}: expected 'add', or 'toggle'/'delete' with an 'id'")
+
+        def batch():
+            # Checked before anything is applied, so a missing task leaves the whole batch undone
+            # without rolling back the other clients' writes in the same TaskManager batch
+            deleted = set()
+            for index, (kind, value) in enumerate(steps):
+                if kind != 'add' and (value in deleted or self.task_manager.get_task(value) is None):
+                    return 404, {"error": f"op {index}: no task with id '{value}'"}
+                if kind == 'delete':
+                    deleted.add(value)
+            results = []
+            for kind, value in steps:
+                if kind == 'add':
+                    results.append(self.task_manager.get_task(self.task_manager.add_task(*value)).to_dict())
+                elif kind == 'toggle':
+                    self.task_manager.toggle_task_status(value)
+                    results.append(self.task_manager.get_task(value).to_dict())
+                else:
+                    self.task_manager.delete_task(value)
+                    results.append({"id": value, "deleted": True})
+            return 200, {"results": results}
+        return batch
+
+    async def _write(self, operation):
+        future = self._loop.create_future()
+        await self._write_queue.put((operation, future))
+        return await future
+
+    async def _run_writer(self):
+        while True:
+            writes = [await self._write_queue.get()]
+            while not self._write_queue.empty(): # Everything that arrived meanwhile joins this batch
+                writes.append(self._write_queue.get_nowait())
+            try:
+                results = await self._loop.run_in_executor(self._write_executor, self._apply_writes, writes)
+            except Exception as e:
+                for _, future in writes:
+                    if not future.done(): # Done if the client went away
+                        future.set_exception(e)
+                continue
+            for (_, future), result in zip(writes, results):
+                if not future.done():
+                    future.set_result(result)
+
+    def _apply_writes(self, writes):
+        # Runs on the writer thread; the TaskManager batch holds its lock and saves once at the end
+        with self.task_manager.batch():
+            results = [operation() for operation, _ in writes]
+        self.writes += len(writes)
+        self.write_batches += 1
+        return results
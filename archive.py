@@ -0,0 +1,65 @@
+# archive.py
+import gzip
+import json
+import os
+import zlib
+from file_lock import file_signature
+
+# zlib's default: about as small as level 9 for JSON text, in a fraction of the time
+COMPRESS_LEVEL = 6
+
+class TaskArchive:
+    """
+    Gzip-compressed file of archived tasks (completed a while ago), one JSON task per line,
+    kept next to the tasks snapshot. Nothing is read until iter_tasks() is called.
+
+    append() adds a gzip member to the end of the file, so archiving more tasks never
+    rewrites the ones already there; only remove() does. If a task ends up both here and in
+    the tasks snapshot (e.g. after a crash in between), the snapshot's copy is the current one.
+    """
+    def __init__(self, path):
+        self.path = path
+        self._signature = None # The file as this process last read or wrote it
+
+    def changed(self):
+        """True if another process wrote the file since this one last read or wrote it (stats only)."""
+        return file_signature(self.path) != self._signature
+
+    def iter_tasks(self):
+        """Yields every archived task as a dict in the tasks.json schema."""
+        self._signature = file_signature(self.path)
+        if self._signature is None:
+            return
+        try:
+            with gzip.open(self.path, 'rt', encoding='utf-8') as f:
+                for line in f:
+                    if line.strip():
+                        yield json.loads(line)
+        except (EOFError, OSError, zlib.error, json.JSONDecodeError):
+            # Torn append (e.g. a crash while archiving): those tasks are still in the snapshot
+            print(f"Warning: {self.path} ends with incomplete data. Using the tasks read so far.")
+
+    def append(self, tasks):
+        """Adds task dicts to the archive and waits until they are on disk."""
+        outside_change = self.changed()
+        with open(self.path, 'ab') as f:
+            data = "".join(json.dumps(task, separators=(',', ':')) + "\n" for task in tasks)
+            f.write(gzip.compress(data.encode('utf-8'), COMPRESS_LEVEL))
+            f.flush()
+            os.fsync(f.fileno()) # Must be on disk before the tasks are dropped from the snapshot
+        # Tasks another process archived meanwhile haven't been read; leave them for changed() to report
+        self._signature = None if outside_change else file_signature(self.path)
+
+    def remove(self, task_ids):
+        """Rewrites the archive without the tasks with the given ids."""
+        outside_change = self.changed()
+        remaining = [task for task in self.iter_tasks() if task['id'] not in task_ids]
+        # Write to a temporary file and swap it in, so a crash never leaves a half-written archive
+        tmp_path = self.path + ".tmp"
+        with gzip.open(tmp_path, 'wt', encoding='utf-8', compresslevel=COMPRESS_LEVEL) as f:
+            for task in remaining:
+                f.write(json.dumps(task, separators=(',', ':')) + "\n")
+        with open(tmp_path, 'rb') as f:
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+        self._signature = None if outside_change else file_signature(self.path)
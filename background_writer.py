@@ -0,0 +1,79 @@
+# background_writer.py
+import atexit
+import threading
+
+class BackgroundWriter:
+    """
+    Runs a flush callback on a daemon thread so the caller never waits on disk I/O.
+
+    request() only marks the data as dirty. The thread waits `delay` seconds after the
+    first request, so a burst of changes is merged into a single flush. Pending changes
+    are flushed by close(), which also runs automatically at interpreter exit.
+    """
+    def __init__(self, flush_callback, delay=0.5):
+        self._flush_callback = flush_callback
+        self.delay = delay
+        self._condition = threading.Condition()
+        self._dirty = False
+        self._writing = False
+        self._hurry = False # flush() wants the current delay cut short
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="BackgroundWriter", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def request(self):
+        """Schedules a flush. After close() the flush runs immediately on the calling thread."""
+        with self._condition:
+            if not self._closed:
+                if not self._dirty:
+                    self._dirty = True
+                    self._condition.notify_all() # Wake the idle thread; later requests just join this flush
+                return
+        self._flush_callback()
+
+    def pending(self):
+        """True while there are changes that haven't been written yet (or are being written)."""
+        with self._condition:
+            return self._dirty or self._writing
+
+    def flush(self, timeout=None):
+        """Blocks until all requested changes are written. Returns False on timeout."""
+        with self._condition:
+            # Skip the remaining debounce delay, even if the thread hasn't started waiting it out yet
+            self._hurry = True
+            self._condition.notify_all()
+            return self._condition.wait_for(lambda: not (self._dirty or self._writing), timeout)
+
+    def close(self):
+        """Flushes pending changes and stops the thread. Safe to call more than once."""
+        with self._condition:
+            if self._closed:
+                return
+            self._closed = True
+            self._condition.notify_all()
+        self._thread.join()
+        atexit.unregister(self.close)
+
+    def _run(self):
+        while True:
+            with self._condition:
+                self._condition.wait_for(lambda: self._dirty or self._closed)
+                if not self._dirty:
+                    return # Closed with nothing left to write
+                if not self._closed:
+                    # Give the burst a moment to finish; flush() and close() cut this short
+                    self._condition.wait_for(lambda: self._hurry or self._closed, self.delay)
+                self._hurry = False
+                self._dirty = False
+                self._writing = True
+            try:
+                self._flush_callback()
+            except Exception as e:
+                print(f"Warning: background save failed: {e}")
+                with self._condition:
+                    self._dirty = not self._closed # Retry on the next round unless shutting down
+            finally:
+                with self._condition:
+                    self._writing = False
+                    self._condition.notify_all()
@@ -0,0 +1,128 @@
+# bench_api.py
+"""
+Throughput and latency of the local HTTP API under concurrent clients.
+
+The server runs in its own process (like the desktop app with --api), on a synthetic task
+list saved the way main.py saves it (journal, background writer). Each client keeps one
+connection open and sends requests back to back.
+
+Run from the project root:
+    python benchmarks/bench_api.py
+    python benchmarks/bench_api.py --tasks 100000 --clients 1 8 32 --requests 200
+"""
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from synthetic import write_tasks_file
+
+MIXES = {
+    "read": 0.0,   # share of writes
+    "write": 1.0,
+    "mixed": 0.2,
+}
+
+def run_server(path, connection):
+    from api_server import TaskAPIServer
+    from task_manager import TaskManager
+    task_manager = TaskManager(path, journal=True, write_behind=True)
+    server = TaskAPIServer(task_manager, port=0)
+    server.start_in_thread()
+    connection.send(server.port)
+    connection.recv() # Wait for the benchmark to finish
+    server.stop()
+    task_manager.close()
+
+async def request(reader, writer, method, path, body=None):
+    data = json.dumps(body).encode() if body is not None else b''
+    writer.write(f"{method} {path} HTTP/1.1\r\nHost: localhost\r\nContent-Length: {len(data)}\r\n\r\n".encode() + data)
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line == b'\r\n':
+            break
+        name, _, value = line.decode().partition(':')
+        if name.lower() == 'content-length':
+            length = int(value)
+    payload = json.loads(await reader.readexactly(length)) if length else None
+    return status, payload
+
+async def client(port, count, write_share, task_ids, latencies, seed):
+    rng = random.Random(seed)
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    for i in range(count):
+        start = time.perf_counter()
+        if rng.random() < write_share:
+            if rng.random() < 0.5:
+                status, _ = await request(reader, writer, 'POST', '/tasks',
+                                          {"description": f"API task {seed} {i}", "category": "Work"})
+            else:
+                status, _ = await request(reader, writer, 'POST', f'/tasks/{rng.choice(task_ids)}/toggle')
+        else:
+            sort_by = rng.choice(['created_at', 'due_date', 'description', 'completed'])
+            status, _ = await request(reader, writer, 'GET', f'/tasks?limit=50&sort_by={sort_by}')
+        latencies.append(time.perf_counter() - start)
+        assert status in (200, 201), status
+    writer.close()
+
+async def run_load(port, clients, requests_per_client, write_share, task_ids):
+    latencies = []
+    start = time.perf_counter()
+    await asyncio.gather(*(client(port, requests_per_client, write_share, task_ids, latencies, seed)
+                           for seed in range(clients)))
+    elapsed = time.perf_counter() - start
+    return elapsed, sorted(latencies)
+
+async def get_json(port, path):
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    _, payload = await request(reader, writer, 'GET', path)
+    writer.close()
+    return payload
+
+def percentile(sorted_values, fraction):
+    return sorted_values[min(int(len(sorted_values) * fraction), len(sorted_values) - 1)]
+
+def main():
+    parser = argparse.ArgumentParser(description="Local HTTP API benchmark")
+    parser.add_argument("--tasks", type=int, default=10000, help="tasks in the list")
+    parser.add_argument("--clients", type=int, nargs="+", default=[1, 8, 32], help="concurrent clients")
+    parser.add_argument("--requests", type=int, default=200, help="requests per client")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "tasks.json")
+        write_tasks_file(path, args.tasks)
+        with open(path) as f:
+            task_ids = [task["id"] for task in json.load(f)]
+        parent_connection, child_connection = multiprocessing.Pipe()
+        server = multiprocessing.Process(target=run_server, args=(path, child_connection))
+        server.start()
+        port = parent_connection.recv()
+        try:
+            print(f"{'mix':<6} {'clients':>7} {'req/s':>9} {'p50':>9} {'p95':>9} {'p99':>9} {'batches':>7}")
+            for mix, write_share in MIXES.items():
+                for clients in args.clients:
+                    before = asyncio.run(get_json(port, '/stats'))
+                    elapsed, latencies = asyncio.run(run_load(port, clients, args.requests, write_share, task_ids))
+                    after = asyncio.run(get_json(port, '/stats'))
+                    # Writes are applied in batches, each persisted as one record
+                    batches = after["write_batches"] - before["write_batches"]
+                    print(f"{mix:<6} {clients:>7} {len(latencies) / elapsed:>9.0f} "
+                          f"{percentile(latencies, 0.5) * 1000:>7.2f}ms {percentile(latencies, 0.95) * 1000:>7.2f}ms "
+                          f"{percentile(latencies, 0.99) * 1000:>7.2f}ms {batches:>7}")
+        finally:
+            parent_connection.send("stop")
+            server.join()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+# bench_archive.py
+"""
+Loading and saving a task list most of whose tasks were completed long ago, with every task
+in tasks.json and with the completed ones moved to the archive (archive_after).
+
+Run from the project root:
+    python benchmarks/bench_archive.py [task_count ...]
+"""
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from synthetic import generate_tasks
+from task_manager import DEFAULT_ARCHIVE_AFTER_DAYS, TaskManager
+
+# Share of the tasks that are completed, as in a list used for years
+COMPLETED_SHARE = 0.9
+
+def write_lifetime_tasks(path, count):
+    """A synthetic tasks.json where COMPLETED_SHARE of the tasks are completed (all before the archive age)."""
+    with open(path, 'w') as f:
+        f.write("[\n")
+        for i, task in enumerate(generate_tasks(count)):
+            task["completed"] = i % 10 < COMPLETED_SHARE * 10
+            f.write((",\n" if i else "") + json.dumps(task))
+        f.write("\n]\n")
+
+def timed(function):
+    start = time.perf_counter()
+    result = function()
+    return time.perf_counter() - start, result
+
+def measure(path):
+    """Returns (load, snapshot save, open tasks query, all tasks query) seconds for the tasks file at path."""
+    load, task_manager = timed(lambda: TaskManager(path, journal=True, cache_size=0))
+    save, _ = timed(task_manager._save_tasks)
+    open_query, _ = timed(lambda: task_manager.get_tasks(include_completed=False))
+    all_query, _ = timed(task_manager.get_tasks) # Reads the archive, if there is one
+    task_manager.close()
+    return load, save, open_query, all_query
+
+def main(counts):
+    print(f"{'tasks':>9} {'layout':<9} {'load':>10} {'save':>10} {'open query':>11} {'all (1st)':>10}")
+    with tempfile.TemporaryDirectory() as directory:
+        for count in counts:
+            path = os.path.join(directory, f"tasks_{count}", "tasks.json")
+            os.makedirs(os.path.dirname(path))
+            write_lifetime_tasks(path, count)
+            rows = [("all hot", measure(path))]
+            archiving, _ = timed(lambda: TaskManager(path, journal=True,
+                                                     archive_after=DEFAULT_ARCHIVE_AFTER_DAYS).close())
+            rows.append(("archived", measure(path)))
+            for layout, timings in rows:
+                print(f"{count:>9} {layout:<9} " + " ".join(f"{seconds * 1000:>8.1f}ms" for seconds in timings))
+            print(f"{count:>9} archiving once: {archiving * 1000:.1f}ms")
+            shutil.rmtree(os.path.dirname(path))
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [10000, 100000])
@@ -0,0 +1,75 @@
+# bench_columnar.py
+"""
+get_tasks() on a large task list: filtering and sorting Task objects one by one, against the
+columnar store (columnar=True) with NumPy and with the array module fallback. Results are
+not cached (cache_size=0), so every call runs the whole query.
+
+Run from the project root:
+    python benchmarks/bench_columnar.py [task_count]
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import columnar
+from synthetic import write_tasks_file
+from task_manager import SORT_KEYS, TaskManager
+
+REPEATS = 3
+
+# (label, get_tasks() arguments)
+QUERIES = [(f"all by {sort_by}", (None, True, sort_by)) for sort_by in SORT_KEYS] + [
+    ("open by created_at", (None, False, 'created_at')),
+    ("Work by due_date", ('Work', True, 'due_date')),
+    ("open Work by description", ('Work', False, 'description')),
+]
+
+def best_time(function):
+    """Fastest of REPEATS runs, in seconds, and the result of the last one."""
+    best = None
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        result = function()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+def main(count):
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "tasks.json")
+        write_tasks_file(path, count)
+        task_manager = TaskManager(path, cache_size=0, columnar=True)
+        columns = task_manager._columns
+        engines = [("objects", None, None), ("array", columns, False)]
+        if columnar.numpy is not None:
+            engines.append(("numpy", columns, True))
+        else:
+            print("NumPy is not installed; measuring the array fallback only")
+
+        print(f"{count} tasks")
+        print(f"{'query':<26}" + "".join(f"{name:>10}" for name, _, _ in engines) + f"{'speedup':>9}")
+        for label, (category, include_completed, sort_by) in QUERIES:
+            timings = []
+            expected = None
+            for name, store, use_numpy in engines:
+                task_manager._columns = store
+                if store is not None:
+                    store.use_numpy = use_numpy
+                    store._sort_column(sort_by) # Description ranks are computed once, not per query
+                seconds, tasks = best_time(lambda: task_manager.get_tasks(category, include_completed, sort_by))
+                ids = [task.id for task in tasks]
+                if expected is None:
+                    expected = ids
+                elif ids != expected:
+                    raise AssertionError(f"{name} returned different tasks for '{label}'")
+                timings.append(seconds)
+            print(f"{label:<26}" + "".join(f"{seconds * 1000:>8.0f}ms" for seconds in timings)
+                  + f"{timings[0] / timings[-1]:>8.1f}x")
+        task_manager._columns = columns
+        task_manager.close()
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000000)
@@ -0,0 +1,43 @@
+# bench_search.py
+"""
+Measures search-as-you-type latency: every prefix of a few queries is searched the way
+the GUI's search box runs them, and the time per keystroke is reported.
+
+Run from the project root:
+    python benchmarks/bench_search.py [task_count]
+"""
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from synthetic import write_tasks_file
+from task_manager import TaskManager
+
+QUERIES = ["groceries", "fix bug", "review code", "passport", "xyz"]
+
+def main(count):
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "tasks.json")
+        write_tasks_file(path, count)
+        task_manager = TaskManager(path)
+        start = time.perf_counter()
+        task_manager.index_for_search()
+        print(f"{count} tasks, search index built in {(time.perf_counter() - start) * 1000:.0f}ms")
+        print(f"{'query':>14} {'sort':>12} {'results':>8} {'median':>9} {'slowest':>9}")
+        for sort_by in ('created_at', 'due_date', 'description', 'completed'):
+            for query in QUERIES:
+                timings = []
+                for end in range(1, len(query) + 1): # One search per keystroke
+                    start = time.perf_counter()
+                    results = task_manager.search(query[:end], sort_by=sort_by)
+                    timings.append(time.perf_counter() - start)
+                print(f"{query!r:>14} {sort_by:>12} {len(results):>8} "
+                      f"{statistics.median(timings) * 1000:>7.1f}ms {max(timings) * 1000:>7.1f}ms")
+        task_manager.close()
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
@@ -0,0 +1,47 @@
+# bench_startup.py
+"""
+Compares time-to-first-paint of the eager load (json.load of the whole file before
+the window can draw) with the lazy, streaming load main.py uses.
+
+Run from the project root:
+    python benchmarks/bench_startup.py [task_count ...]
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from gui import TodoAppGUI
+from synthetic import write_tasks_file
+from task_manager import TaskManager
+
+def time_eager(path):
+    start = time.perf_counter()
+    task_manager = TaskManager(path)
+    task_manager.get_tasks() # What the first paint queries
+    return time.perf_counter() - start
+
+def time_lazy(path):
+    start = time.perf_counter()
+    task_manager = TaskManager(path, lazy=True)
+    task_manager.load_more(TodoAppGUI.FIRST_PAINT_TASKS)
+    task_manager.get_tasks()
+    first_paint = time.perf_counter() - start
+    while task_manager.load_more(TodoAppGUI.LOAD_SLICE_TASKS):
+        pass
+    return first_paint, time.perf_counter() - start
+
+def main(counts):
+    print(f"{'tasks':>9} {'eager first paint':>18} {'lazy first paint':>17} {'lazy fully loaded':>18}")
+    with tempfile.TemporaryDirectory() as directory:
+        for count in counts:
+            path = os.path.join(directory, f"tasks_{count}.json")
+            write_tasks_file(path, count)
+            eager = time_eager(path)
+            lazy_first_paint, lazy_total = time_lazy(path)
+            print(f"{count:>9} {eager * 1000:>16.1f}ms {lazy_first_paint * 1000:>15.1f}ms {lazy_total * 1000:>16.1f}ms")
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [1000, 10000, 100000])
@@ -0,0 +1,184 @@
+# bench_suite.py
+"""
+Times the main TaskManager operations and the GUI refresh path on synthetic task lists,
+writes the results to JSON and compares them with a stored baseline.
+
+Run from the project root:
+    python benchmarks/bench_suite.py                      # 1k, 10k and 100k tasks
+    python benchmarks/bench_suite.py --sizes 1000000      # up to 1M tasks
+    python benchmarks/bench_suite.py --save-baseline      # record a new baseline
+
+Exits with status 1 if a timing got slower than the baseline by more than --threshold.
+Baselines are machine specific: record one on the machine you compare on. The stored one
+belongs to the commit it was recorded at, so re-record it in every change to a measured path.
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from gui import TodoAppGUI
+from synthetic import write_tasks_file
+from task_list_view import VirtualTaskList
+from task_manager import TaskManager, SORT_KEYS
+
+DEFAULT_SIZES = [1000, 10000, 100000]
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+# A timing regresses if it is this many times the baseline...
+DEFAULT_THRESHOLD = 1.5
+# ...and at least this much slower in absolute terms, so sub-millisecond noise isn't reported
+MIN_REGRESSION_SECONDS = 0.0005
+# Mutations timed per size; the result is the average per call
+MUTATION_COUNT = 100
+
+def best_of(repeat, function):
+    """Runs function repeat times and returns the fastest run in seconds."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+def per_call(function, args_list):
+    """Calls function once per args tuple and returns the average seconds per call."""
+    start = time.perf_counter()
+    for args in args_list:
+        function(*args)
+    return (time.perf_counter() - start) / len(args_list)
+
+class _Widget:
+    """Stands in for the Tk widgets and variables _load_tasks_to_listbox reads."""
+    def __init__(self, value=""):
+        self.value = value
+        self.options = {}
+
+    def get(self):
+        return self.value
+
+    def set(self, value):
+        self.value = value
+
+    def __setitem__(self, key, value):
+        self.options[key] = value
+
+class _TaskList:
+    """Stands in for VirtualTaskList: formats the rows the real widget would draw on the first screen."""
+    def __init__(self, height=15):
+        self.height = height
+
+    def set_rows(self, count, row_provider):
+        for index in range(min(count, self.height + VirtualTaskList.OVERSCAN)):
+            row_provider(index)
+
+def headless_gui(task_manager):
+    """A TodoAppGUI without Tk, enough to run _load_tasks_to_listbox."""
+    app = TodoAppGUI.__new__(TodoAppGUI)
+    app.task_manager = task_manager
+    app.category_filter_combobox = _Widget("All")
+    app.sort_by_combobox = _Widget("Creation Date")
+    app.include_completed_var = _Widget(True)
+    app.search_var = _Widget("")
+    app.task_listbox = _TaskList()
+    return app
+
+def run_size(directory, count, repeat):
+    path = os.path.join(directory, f"tasks_{count}.json")
+    write_tasks_file(path, count)
+    results = {}
+
+    # Loading: the main.py setup (journal), read eagerly so the whole file is parsed
+    results["load"] = best_of(repeat, lambda: TaskManager(path, journal=True).close())
+
+    # Queries, with the result cache off so every call does the full work
+    task_manager = TaskManager(path, journal=True, cache_size=0)
+    for sort_by in SORT_KEYS:
+        results[f"get_tasks[{sort_by}]"] = best_of(repeat, lambda: task_manager.get_tasks(sort_by=sort_by))
+    results["get_tasks[open, due_date]"] = best_of(
+        repeat, lambda: task_manager.get_tasks(include_completed=False, sort_by='due_date'))
+    results["get_categories"] = best_of(repeat, task_manager.get_categories)
+
+    app = headless_gui(task_manager)
+    for label, sort_by in TodoAppGUI.SORT_BY_MAPPING.items():
+        app.sort_by_combobox.set(label)
+        results[f"load_tasks_to_listbox[{sort_by}]"] = best_of(repeat, app._load_tasks_to_listbox)
+
+    # Mutations, each saved on its own (journal append) like a click in the GUI
+    task_ids = [task.id for task in task_manager.get_tasks()[:MUTATION_COUNT]]
+    results["add_task"] = per_call(task_manager.add_task, [(f"Benchmark task {i}", "Work", "2025-06-01")
+                                                            for i in range(MUTATION_COUNT)])
+    results["toggle_task_status"] = per_call(task_manager.toggle_task_status, [(task_id,) for task_id in task_ids])
+    results["delete_task"] = per_call(task_manager.delete_task, [(task_id,) for task_id in task_ids])
+    task_manager.close()
+    return results
+
+def compare(results, baseline, threshold):
+    """Prints every timing next to its baseline. Returns the list of regressions."""
+    regressions = []
+    print(f"{'tasks':>8} {'benchmark':<34} {'baseline':>11} {'now':>11} {'ratio':>7}")
+    for size, timings in results.items():
+        for name, seconds in timings.items():
+            old = baseline.get(size, {}).get(name)
+            if old is None:
+                print(f"{size:>8} {name:<34} {'-':>11} {seconds * 1000:>9.3f}ms")
+                continue
+            ratio = seconds / old if old else float('inf')
+            regressed = ratio > threshold and seconds - old > MIN_REGRESSION_SECONDS
+            if regressed:
+                regressions.append((size, name, old, seconds))
+            print(f"{size:>8} {name:<34} {old * 1000:>9.3f}ms {seconds * 1000:>9.3f}ms {ratio:>6.2f}x"
+                  + ("  REGRESSION" if regressed else ""))
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="TaskManager and GUI refresh benchmarks")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="task counts to benchmark")
+    parser.add_argument("--repeat", type=int, default=5, help="runs per timing; the fastest is kept")
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="baseline JSON file to compare with")
+    parser.add_argument("--save-baseline", action="store_true", help="store the results as the new baseline")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="slowdown ratio that counts as a regression")
+    args = parser.parse_args()
+
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        for count in args.sizes:
+            print(f"Benchmarking {count} tasks...", file=sys.stderr)
+            results[str(count)] = run_size(directory, count, args.repeat)
+
+    report = {
+        "created_at": datetime.datetime.now().isoformat(timespec='seconds'),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=4)
+    if args.save_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump(report, f, indent=4)
+        print(f"Baseline saved to {args.baseline}")
+        return 0
+
+    try:
+        with open(args.baseline) as f:
+            baseline = json.load(f)["results"]
+    except FileNotFoundError:
+        print(f"No baseline at {args.baseline}; run with --save-baseline to record one.")
+        baseline = {}
+    regressions = compare(results, baseline, args.threshold)
+    if regressions:
+        print(f"\n{len(regressions)} timing(s) regressed by more than {args.threshold}x.")
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
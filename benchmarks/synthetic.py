@@ -0,0 +1,47 @@
+# synthetic.py
+"""
+Reproducible synthetic task lists for the benchmarks: the same seed always gives the same tasks.
+"""
+import datetime
+import json
+import random
+import uuid
+
+# (category, weight): a few big categories and a tail of small ones, like a real list
+CATEGORIES = [("Work", 30), ("Personal", 25), ("Errands", 12), ("Programming", 10), ("Uncategorized", 10),
+              ("Health", 4), ("Finance", 3), ("Travel", 2), ("Home", 2), ("Reading", 2)]
+WORDS = ["buy", "groceries", "milk", "call", "mom", "review", "code", "write", "report", "prepare",
+         "presentation", "fix", "bug", "email", "team", "plan", "trip", "book", "flight", "pay", "bills",
+         "clean", "kitchen", "update", "docs", "meeting", "notes", "renew", "passport", "dentist"]
+START = datetime.datetime(2024, 1, 1)
+
+def generate_tasks(count, seed=0):
+    """Yields count task dicts in the tasks.json schema, oldest first."""
+    rng = random.Random(seed)
+    category_names = [name for name, _ in CATEGORIES]
+    category_weights = [weight for _, weight in CATEGORIES]
+    # A long tail of rare words next to the common ones, so searches hit both broad and narrow matches
+    vocabulary = WORDS + [f"{rng.choice(WORDS)[:3]}{i}" for i in range(max(count // 10, 1))]
+    for i in range(count):
+        created_at = START + datetime.timedelta(seconds=i * 60)
+        due_date = None
+        if rng.random() < 0.6: # Due dates from a month before creation (overdue) to a year after
+            due_date = (created_at.date() + datetime.timedelta(days=rng.randint(-30, 365))).isoformat()
+        yield {
+            "id": str(uuid.UUID(int=rng.getrandbits(128))),
+            "description": " ".join(rng.choice(vocabulary) for _ in range(rng.randint(2, 6))),
+            "completed": rng.random() < 0.3,
+            "created_at": created_at.isoformat(),
+            "category": rng.choices(category_names, category_weights)[0],
+            "due_date": due_date
+        }
+
+def write_tasks_file(path, count, seed=0):
+    """Writes a tasks.json with count synthetic tasks, one task at a time so 1M tasks fit in memory."""
+    with open(path, 'w') as f:
+        f.write("[\n")
+        for i, task in enumerate(generate_tasks(count, seed)):
+            if i:
+                f.write(",\n")
+            json.dump(task, f)
+        f.write("\n]\n")
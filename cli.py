@@ -0,0 +1,205 @@
+# cli.py
+"""
+Command-line access to the task list, without starting the window (no display needed):
+
+    python cli.py add "Buy groceries" --category Personal --due 2025-07-25
+    python cli.py list --open --sort due_date
+    python cli.py query "gro mil"
+    python cli.py toggle <task id> ...
+    python cli.py delete <task id> ...
+    python cli.py import tasks.csv
+    python cli.py export backup.jsonl
+    python cli.py serve --port 8765
+
+Uses the same tasks.json as main.py unless --file or --sqlite is given.
+"""
+import argparse
+import os
+import sys
+from api_server import DEFAULT_PORT, TaskAPIServer
+from storage import SQLiteStorage
+from task import parse_due_date
+from task_io import FORMATS, TaskImportError, format_for_path, read_tasks, write_tasks
+from task_manager import TaskManager, SORT_KEYS
+
+BASEDIR = os.path.abspath(os.path.dirname(__file__))
+# Skipped import rows printed before the rest are only counted
+MAX_SKIPS_SHOWN = 20
+
+def due_date_argument(value):
+    try:
+        parse_due_date(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid due date '{value}', expected YYYY-MM-DD") from None
+    return value
+
+def limit_argument(value):
+    try:
+        limit = int(value)
+    except ValueError:
+        limit = -1
+    if limit < 0:
+        raise argparse.ArgumentTypeError(f"invalid limit '{value}', expected a number 0 or larger")
+    return limit
+
+def open_task_manager(args):
+    if args.sqlite:
+        return TaskManager(storage=SQLiteStorage(args.db or os.path.join(BASEDIR, "tasks.db")))
+    return TaskManager(filename=args.file or os.path.join(BASEDIR, "tasks.json"), journal=True)
+
+def format_task(task):
+    due = f", due {task['due_date']}" if task.due_date else ""
+    return f"[{'DONE' if task.completed else 'TODO'}] {task.id}  {task.description} ({task.category}{due})"
+
+def print_tasks(tasks, fmt):
+    if fmt == 'text':
+        for task in tasks:
+            print(format_task(task))
+    else:
+        write_tasks(sys.stdout, tasks, fmt)
+
+def command_add(task_manager, args):
+    task_id = task_manager.add_task(args.description, args.category, args.due)
+    if not task_id:
+        print("Error: the description is empty.", file=sys.stderr)
+        return 1
+    print(task_id)
+    return 0
+
+def command_list(task_manager, args):
+    tasks = task_manager.iter_tasks(args.category, not args.open, args.sort, args.limit)
+    print_tasks(tasks, args.format)
+    return 0
+
+def command_query(task_manager, args):
+    tasks = task_manager.search(args.text, args.category, not args.open, args.sort)
+    print_tasks(tasks[:args.limit] if args.limit is not None else tasks, args.format)
+    return 0
+
+def command_toggle(task_manager, args):
+    return change_tasks(args.task_ids, task_manager.toggle_task_status, task_manager)
+
+def command_delete(task_manager, args):
+    return change_tasks(args.task_ids, task_manager.delete_task, task_manager)
+
+def change_tasks(task_ids, change, task_manager):
+    missing = []
+    with task_manager.batch(): # One write for all of them
+        for task_id in task_ids:
+            if not change(task_id):
+                missing.append(task_id)
+    for task_id in missing:
+        print(f"Error: no task with ID '{task_id}'.", file=sys.stderr)
+    return 1 if missing else 0
+
+def command_import(task_manager, args):
+    fmt = args.format or format_for_path(args.path)
+    skipped = 0
+
+    def on_skip(row_number, reason):
+        nonlocal skipped
+        skipped += 1
+        if skipped <= MAX_SKIPS_SHOWN:
+            print(f"Skipped row {row_number}: {reason}", file=sys.stderr)
+
+    f = sys.stdin if args.path == '-' else open(args.path, 'r', newline='', encoding='utf-8')
+    try:
+        imported = task_manager.import_tasks(read_tasks(f, fmt), args.skip_invalid, on_skip)
+    except TaskImportError as e:
+        print(f"Error: nothing imported, {e}", file=sys.stderr)
+        print("Fix the rows or pass --skip-invalid to import the valid ones.", file=sys.stderr)
+        return 1
+    except ValueError as e: # Unreadable file, e.g. a malformed JSON line
+        print(f"Error: nothing imported, {args.path} can't be read as {fmt}: {e}", file=sys.stderr)
+        return 1
+    finally:
+        if f is not sys.stdin:
+            f.close()
+    print(f"Imported {imported} tasks" + (f", skipped {skipped} rows." if skipped else "."))
+    return 0
+
+def command_export(task_manager, args):
+    fmt = args.format or format_for_path(args.path)
+    tasks = task_manager.iter_tasks(args.category, not args.open, args.sort)
+    if args.path == '-':
+        write_tasks(sys.stdout, tasks, fmt)
+        return 0
+    with open(args.path, 'w', newline='', encoding='utf-8') as f:
+        written = write_tasks(f, tasks, fmt)
+    print(f"Exported {written} tasks to {args.path}.", file=sys.stderr)
+    return 0
+
+def command_serve(task_manager, args):
+    server = TaskAPIServer(task_manager, port=args.port)
+    print(f"Serving the task API on http://127.0.0.1:{args.port}/ (Ctrl+C to stop)", file=sys.stderr)
+    server.serve_forever()
+    return 0
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Super To-Do List from the command line")
+    parser.add_argument("--file", help="tasks file to use (default: tasks.json next to main.py)")
+    parser.add_argument("--sqlite", action="store_true", help="use the SQLite database instead of tasks.json")
+    parser.add_argument("--db", help="with --sqlite, the database file (default: tasks.db next to main.py)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    def add_filters(command, default_format):
+        command.add_argument("-c", "--category", help="only tasks in this category")
+        command.add_argument("--open", action="store_true", help="leave out completed tasks")
+        command.add_argument("--sort", choices=list(SORT_KEYS), default="created_at", help="sort order")
+        command.add_argument("--format", choices=[default_format] + list(FORMATS) if default_format else FORMATS,
+                             default=default_format, help="output format")
+
+    add = commands.add_parser("add", help="add a task and print its ID")
+    add.add_argument("description")
+    add.add_argument("-c", "--category", default="Uncategorized")
+    add.add_argument("--due", type=due_date_argument, help="due date, YYYY-MM-DD")
+    add.set_defaults(run=command_add)
+
+    list_command = commands.add_parser("list", help="list tasks")
+    add_filters(list_command, "text")
+    list_command.add_argument("--limit", type=limit_argument, help="show at most this many tasks")
+    list_command.set_defaults(run=command_list)
+
+    query = commands.add_parser("query", help="list tasks with words starting with each word of TEXT")
+    query.add_argument("text")
+    add_filters(query, "text")
+    query.add_argument("--limit", type=limit_argument, help="show at most this many tasks")
+    query.set_defaults(run=command_query)
+
+    for name, run, help_text in (("toggle", command_toggle, "mark tasks done or not done"),
+                                 ("delete", command_delete, "delete tasks")):
+        command = commands.add_parser(name, help=help_text)
+        command.add_argument("task_ids", nargs="+", metavar="ID")
+        command.set_defaults(run=run)
+
+    import_command = commands.add_parser("import", help="add tasks from a JSONL, CSV or JSON file ('-' for stdin)")
+    import_command.add_argument("path")
+    import_command.add_argument("--format", choices=FORMATS, help="file format (default: from the extension, else jsonl)")
+    import_command.add_argument("--skip-invalid", action="store_true",
+                                help="import the valid rows even if some are invalid")
+    import_command.set_defaults(run=command_import)
+
+    export = commands.add_parser("export", help="write tasks to a JSONL, CSV or JSON file ('-' for stdout)")
+    export.add_argument("path")
+    add_filters(export, None)
+    export.set_defaults(run=command_export)
+
+    serve = commands.add_parser("serve", help="serve the local HTTP/JSON API (see api_server.py)")
+    serve.add_argument("--port", type=int, default=DEFAULT_PORT)
+    serve.set_defaults(run=command_serve)
+    return parser
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    task_manager = open_task_manager(args)
+    try:
+        return args.run(task_manager, args)
+    except BrokenPipeError:
+        # Output piped into e.g. head, which stopped reading; silence the flush at exit too
+        sys.stdout = open(os.devnull, 'w')
+        return 1
+    finally:
+        task_manager.close()
+
+if __name__ == "__main__":
+    sys.exit(main())
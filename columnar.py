@@ -0,0 +1,213 @@
+# columnar.py
+import bisect
+import datetime
+import itertools
+import operator
+from array import array
+
+try:
+    import numpy
+except ImportError: # Optional: without it the same columns are scanned with C-level iterators
+    numpy = None
+
+_EPOCH = datetime.datetime.min
+_MICROSECOND = datetime.timedelta(microseconds=1)
+# Tasks without a due date sort last, like SORT_KEYS['due_date'] in task_manager.py
+_NO_DUE_DATE = datetime.date.max.toordinal()
+# The columns are rebuilt without deleted rows once these make up half of them
+_MIN_COMPACT_ROWS = 1024
+# Description ranks are spread over 0.._MAX_RANK, leaving room to rank new descriptions in between
+_MAX_RANK = 2 ** 31 - 1
+# Once more than 1/_RERANK_SHARE of the descriptions are new, all are ranked again rather than one by one
+_RERANK_SHARE = 64
+
+def _timestamp(moment):
+    """created_at as an integer that sorts like the datetime: microseconds since datetime.min."""
+    if moment.tzinfo is not None:
+        moment = moment.astimezone(datetime.timezone.utc).replace(tzinfo=None)
+    return (moment - _EPOCH) // _MICROSECOND
+
+class ColumnStore:
+    """
+    Tasks as parallel columns, one row per task in insertion order, so filtering and sorting
+    work on contiguous arrays of numbers instead of reading attributes task by task:
+
+        completed      0/1
+        category       a small integer code per category name
+        due date       date ordinal, tasks without one get the largest
+        created_at     microseconds, see _timestamp()
+        description    a code per distinct description.lower(), see _ranked_descriptions()
+
+    With NumPy installed query() builds a boolean mask and sorts the matching rows by key
+    right in the arrays' memory. Without it the same columns go through map()/compress() and
+    a sort keyed on the column, which saves little besides lowering every description. Either
+    way the result is what filtering in insertion order and a stable sort by SORT_KEYS give.
+    Deleted rows are only marked, and dropped in bulk by _compact().
+    """
+    def __init__(self, use_numpy=None):
+        self.use_numpy = numpy is not None if use_numpy is None else use_numpy
+        self._tasks = [] # Task per row, None once deleted
+        self._rows = {} # {task_id: row}
+        self._category_codes = {} # {category: code}
+        self._description_codes = {} # {lowered description: code}
+        self._descriptions = [] # Lowered description per code
+        # Description codes and descriptions in sorted order, up to the ones added since the last ranking
+        self._sorted_codes = []
+        self._sorted_descriptions = []
+        self._code_ranks = None # Rank per description code, None until the first description sort
+        self._reset()
+
+    def _reset(self):
+        self._alive = array('b')
+        self._completed = array('b')
+        self._category = array('i')
+        self._due = array('i')
+        self._created = array('q')
+        self._description = array('i')
+        self._description_ranks = array('i') # Rank per row, filled in by _ranked_descriptions()
+        self._dead = 0
+
+    def __len__(self):
+        return len(self._rows)
+
+    def add(self, task):
+        if task.id in self._rows: # Replaced by a newer copy
+            self.remove(task.id)
+        self._rows[task.id] = len(self._tasks)
+        self._tasks.append(task)
+        self._alive.append(1)
+        self._completed.append(task.completed)
+        code = self._category_codes.get(task.category)
+        if code is None:
+            code = self._category_codes[task.category] = len(self._category_codes)
+        self._category.append(code)
+        self._due.append(task.due_date.toordinal() if task.due_date else _NO_DUE_DATE)
+        self._created.append(_timestamp(task.created_at))
+        description = task.description.lower()
+        code = self._description_codes.get(description)
+        if code is None:
+            code = self._description_codes[description] = len(self._descriptions)
+            self._descriptions.append(description)
+        self._description.append(code)
+
+    def remove(self, task_id):
+        row = self._rows.pop(task_id)
+        self._tasks[row] = None
+        self._alive[row] = 0
+        self._dead += 1
+        if self._dead >= _MIN_COMPACT_ROWS and self._dead * 2 >= len(self._tasks):
+            self._compact()
+
+    def set_completed(self, task_id, completed):
+        row = self._rows.get(task_id)
+        if row is not None: # Not an archived task
+            self._completed[row] = completed
+
+    def _compact(self):
+        tasks = [task for task in self._tasks if task is not None]
+        self._tasks = []
+        self._rows = {}
+        self._reset()
+        for task in tasks:
+            self.add(task)
+
+    def _ranked_descriptions(self):
+        """
+        The description column as ranks that sort like the descriptions. Ranks are spaced out,
+        so a new description usually takes a free rank between its neighbours and the
+        existing ones stay as they are; only when there's no room left (or when many
+        descriptions are new, e.g. after loading) are all of them sorted and ranked again.
+        """
+        new_codes = range(len(self._sorted_codes), len(self._descriptions))
+        if self._code_ranks is None or len(new_codes) * _RERANK_SHARE > len(self._sorted_codes):
+            self._rank_all()
+        else:
+            for code in new_codes:
+                if not self._rank_new(code):
+                    self._rank_all()
+                    break
+        ranks = self._description_ranks
+        if len(ranks) < len(self._description): # Rows added since the last description sort
+            ranks.extend(map(self._code_ranks.__getitem__, self._description[len(ranks):]))
+        return ranks
+
+    def _rank_all(self):
+        sorted_codes = self._sorted_codes
+        sorted_codes.extend(range(len(sorted_codes), len(self._descriptions)))
+        sorted_codes.sort(key=self._descriptions.__getitem__) # Mostly one sorted run already
+        self._sorted_descriptions = list(map(self._descriptions.__getitem__, sorted_codes))
+        spacing = _MAX_RANK // (len(sorted_codes) + 1)
+        self._code_ranks = array('i', [0]) * len(sorted_codes)
+        for position, code in enumerate(sorted_codes, 1):
+            self._code_ranks[code] = position * spacing
+        self._description_ranks = array('i') # Every row is ranked again
+
+    def _rank_new(self, code):
+        """Ranks a new description between its neighbours. Returns False if they have no rank left between them."""
+        description = self._descriptions[code]
+        position = bisect.bisect_left(self._sorted_descriptions, description)
+        low = self._code_ranks[self._sorted_codes[position - 1]] if position else 0
+        high = self._code_ranks[self._sorted_codes[position]] if position < len(self._sorted_codes) else _MAX_RANK
+        if high - low < 2:
+            return False
+        self._sorted_codes.insert(position, code)
+        self._sorted_descriptions.insert(position, description)
+        self._code_ranks.append((low + high) // 2)
+        return True
+
+    def _sort_column(self, sort_by):
+        if sort_by == 'description':
+            return self._ranked_descriptions()
+        return {'created_at': self._created, 'due_date': self._due, 'completed': self._completed}.get(sort_by)
+
+    def query(self, category=None, include_completed=True, sort_by='created_at'):
+        """
+        Returns the tasks in category (all if None), without completed ones unless include_completed,
+        sorted by sort_by like TaskManager.get_tasks() (in insertion order if it isn't a SORT_KEYS key).
+        """
+        code = None
+        if category is not None:
+            code = self._category_codes.get(category)
+            if code is None:
+                return []
+        column = self._sort_column(sort_by)
+        if self.use_numpy:
+            rows = self._numpy_rows(code, include_completed, column)
+        else:
+            rows = self._array_rows(code, include_completed, column)
+        return list(map(self._tasks.__getitem__, rows))
+
+    def _numpy_rows(self, code, include_completed, column):
+        # Views of the arrays' memory, not copies. They must not outlive this call: an array
+        # can't grow while a view of it exists.
+        mask = numpy.frombuffer(self._alive, numpy.bool_)
+        if code is not None:
+            mask = mask & (numpy.frombuffer(self._category, self._category.typecode) == code)
+        if not include_completed:
+            mask = mask & (numpy.frombuffer(self._completed, self._completed.typecode) == 0)
+        rows = numpy.flatnonzero(mask)
+        if column is not None:
+            keys = numpy.frombuffer(column, column.typecode)[rows]
+            if column.itemsize == 4:
+                # Key and row in one int64: all distinct, so a plain sort (several times faster
+                # than a stable argsort) still leaves rows with equal keys in row order
+                packed = keys.astype(numpy.int64) << 32 | rows
+                packed.sort()
+                rows = packed & 0xFFFFFFFF
+            else: # completed (radix sorted) and created_at (mostly in order already)
+                rows = rows[numpy.argsort(keys, kind='stable')]
+        return rows.tolist()
+
+    def _array_rows(self, code, include_completed, column):
+        mask = self._alive if self._dead else None
+        if code is not None:
+            match = map(code.__eq__, self._category)
+            mask = match if mask is None else map(operator.and_, mask, match)
+        if not include_completed:
+            match = map((0).__eq__, self._completed)
+            mask = match if mask is None else map(operator.and_, mask, match)
+        rows = range(len(self._tasks))
+        rows = list(rows) if mask is None else list(itertools.compress(rows, mask))
+        if column is not None:
+            rows.sort(key=column.__getitem__) # Stable, like the argsort
+        return rows
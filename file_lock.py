@@ -0,0 +1,84 @@
+# file_lock.py
+import os
+import threading
+
+try:
+    import fcntl
+except ImportError: # Windows
+    fcntl = None
+    import msvcrt
+
+class FileLock:
+    """
+    Advisory lock shared by every process that uses the same lock file, e.g. two app
+    instances (or the app and a script) writing the same tasks.json:
+
+        with FileLock("tasks.json.lock"):
+            ... # read or write the tasks files
+
+    Advisory means only code that takes the lock is kept out. The lock is re-entrant and
+    also serializes threads of this process, so a save may take it while already holding it.
+    """
+    def __init__(self, path):
+        self.path = path
+        self._thread_lock = threading.RLock()
+        self._depth = 0
+        self._file = None
+
+    def __enter__(self):
+        self._thread_lock.acquire()
+        self._depth += 1
+        if self._depth == 1:
+            try:
+                self._file = open(self.path, 'a+b')
+                if fcntl is not None:
+                    fcntl.flock(self._file.fileno(), fcntl.LOCK_EX)
+                else:
+                    self._lock_windows()
+            except BaseException:
+                self._release_file()
+                self._depth -= 1
+                self._thread_lock.release()
+                raise
+        return self
+
+    def _lock_windows(self):
+        # LK_LOCK gives up after about 10 seconds; another instance can hold the lock for a large save
+        self._file.seek(0)
+        while True:
+            try:
+                msvcrt.locking(self._file.fileno(), msvcrt.LK_LOCK, 1)
+                return
+            except OSError:
+                pass
+
+    def __exit__(self, *exc_info):
+        self._depth -= 1
+        if self._depth == 0:
+            self._release_file()
+        self._thread_lock.release()
+
+    def _release_file(self):
+        if self._file is None:
+            return
+        try:
+            if fcntl is not None:
+                fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+            else:
+                self._file.seek(0)
+                msvcrt.locking(self._file.fileno(), msvcrt.LK_UNLCK, 1)
+        except OSError:
+            pass # Closing the file releases the lock anyway
+        self._file.close()
+        self._file = None
+
+def file_signature(path):
+    """
+    Returns (mtime_ns, size, inode) of path, or None if it doesn't exist. Comparing two
+    signatures tells whether the file was written in between without reading it.
+    """
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size, stat.st_ino)
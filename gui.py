@@ -1,10 +1,38 @@
 import tkinter as tk
 from tkinter import messagebox, ttk
-import datetime # To check for overdue tasks
-from task_manager import TaskManager
+import bisect
+import datetime # For the due-date timer
+import threading
+from task_manager import TaskManager, SORT_KEYS
+from metrics import metrics
+from metrics_panel import MetricsPanel
+from search_index import matches, tokenize
 from styles import AppStyles # Import our styles
+from task_list_view import VirtualTaskList
 
 class TodoAppGUI:
+    SORT_BY_MAPPING = {
+        "Creation Date": "created_at",
+        "Due Date": "due_date",
+        "Description": "description",
+        "Status": "completed"
+    }
+    # Above this many queued changes a full reload is cheaper than patching rows one by one
+    MAX_INCREMENTAL_CHANGES = 200
+    # With a lazily loading TaskManager: tasks read before the first paint, then per event-loop turn
+    FIRST_PAINT_TASKS = 100
+    LOAD_SLICE_TASKS = 10000
+    # Tasks added to the search index per event-loop turn once loading is done
+    INDEX_SLICE_TASKS = 2000
+    # The search runs once typing pauses for this many milliseconds
+    SEARCH_DELAY_MS = 150
+    # How often to look for changes other app instances or scripts saved to the same tasks file
+    EXTERNAL_CHECK_MS = 1000
+    # The due-date timer wakes up at least this often, in case the system clock was changed
+    MAX_DUE_TIMER_MS = 60 * 60 * 1000
+    # How often to look for changes made from other threads (e.g. the local API)
+    THREAD_CHANGES_POLL_MS = 100
+
     def __init__(self, master, task_manager):
         self.master = master
         self.master.title("Super To-Do List (Desktop)")
@@ -17,7 +45,89 @@ class TodoAppGUI:
         self._configure_styles()
         self._create_widgets()
         self._layout_widgets()
+        if self.task_manager.loading:
+            self.task_manager.load_more(self.FIRST_PAINT_TASKS) # Just enough to fill the first screen
         self._load_tasks_to_listbox() # Initial load
+        self.ui_thread = threading.current_thread()
+        self.thread_changes = threading.Event() # Set when another thread changed tasks
+        self.task_manager.add_listener(self._on_task_event) # Patch rows as tasks change
+        self.master.protocol("WM_DELETE_WINDOW", self._on_close)
+        self.metrics_panel = None
+        if metrics.enabled:
+            self.master.bind("<F12>", lambda event: self._show_metrics_panel())
+        if self.task_manager.loading:
+            self.master.after(1, self._load_next_slice) # Read the rest without blocking the window
+        else:
+            self.master.after(1, self._index_next_slice)
+        self.master.after(self.EXTERNAL_CHECK_MS, self._check_external_changes)
+        self.master.after(self.THREAD_CHANGES_POLL_MS, self._check_thread_changes)
+        self._schedule_due_timer()
+
+    def _on_task_event(self, event_type, task):
+        # Tk may only be used from its own thread: changes made elsewhere just raise a flag
+        # (the listener runs with TaskManager's lock held, so it must not wait for the Tk thread)
+        if threading.current_thread() is not self.ui_thread:
+            self.thread_changes.set()
+            return
+        self._on_task_changed(event_type, task)
+
+    def _check_thread_changes(self):
+        if self.thread_changes.is_set():
+            self.thread_changes.clear()
+            # Rows can't be patched reliably from events that were made while we weren't looking
+            if not self.reload_pending:
+                self._schedule_reload()
+            if not self.due_check_pending:
+                self.due_check_pending = True
+                self.master.after_idle(self._schedule_due_timer)
+        self.master.after(self.THREAD_CHANGES_POLL_MS, self._check_thread_changes)
+
+    def _schedule_due_timer(self):
+        """(Re)sets the single timer for the next day a task becomes due soon or overdue."""
+        self.due_check_pending = False
+        day = self.task_manager.next_due_change()
+        if self.due_after_id is not None:
+            if day is None or self.due_timer_day <= day:
+                return # The pending timer fires first; it reschedules itself
+            self.master.after_cancel(self.due_after_id)
+            self.due_after_id = None
+        if day is None:
+            return
+        delay = datetime.datetime.combine(day, datetime.time()) - datetime.datetime.now()
+        delay_ms = min(max(int(delay.total_seconds() * 1000), 0) + 1, self.MAX_DUE_TIMER_MS)
+        self.due_timer_day = day
+        self.due_after_id = self.master.after(delay_ms, self._on_due_timer)
+
+    def _on_due_timer(self):
+        self.due_after_id = None
+        self.task_manager.advance_due_dates() # Sends an event per task that changed, which restyles its row
+        self._schedule_due_timer()
+
+    def _check_external_changes(self):
+        # Only stats the files unless something changed; merged tasks arrive as ordinary row updates
+        self.task_manager.merge_external_changes()
+        self.master.after(self.EXTERNAL_CHECK_MS, self._check_external_changes)
+
+    def _load_next_slice(self):
+        if self.task_manager.load_more(self.LOAD_SLICE_TASKS):
+            self.master.after(1, self._load_next_slice)
+        else:
+            self.master.after(1, self._index_next_slice)
+
+    def _index_next_slice(self):
+        # Build the search index in small steps, so the first search doesn't stall the window
+        if self.task_manager.index_for_search(self.INDEX_SLICE_TASKS):
+            self.master.after(1, self._index_next_slice)
+
+    def _show_metrics_panel(self):
+        if self.metrics_panel is not None and self.metrics_panel.winfo_exists():
+            self.metrics_panel.lift()
+        else:
+            self.metrics_panel = MetricsPanel(self.master)
+
+    def _on_close(self):
+        self.task_manager.close() # Waits for any background save to finish
+        self.master.destroy()
 
     def _configure_styles(self):
         s = ttk.Style()
@@ -85,9 +195,8 @@ class TodoAppGUI:
               background=[('active', AppStyles.BG_COLOR)], # No change on active
               foreground=[('active', AppStyles.TEXT_COLOR)])
 
-        # Listbox style (Tkinter Listbox is hard to style with ttk)
-        # We will manually configure the tk.Listbox in _create_widgets
-        # or consider using a ttk.Treeview for more control, but it's complex for simple list.
+        # Task list style (the list is a custom canvas widget, not a ttk widget)
+        # Its colors and font are passed to VirtualTaskList in _create_widgets.
 
     def _create_widgets(self):
         # --- Input Frame ---
@@ -133,34 +242,48 @@ class TodoAppGUI:
             style=AppStyles.TTK_CHECKBUTTON_STYLE
         )
         self.include_completed_checkbutton.grid(row=1, column=2, sticky="e", padx=(0,5))
+
+        tk.Label(self.controls_frame, text="Search:", font=(AppStyles.FONT_FAMILY, AppStyles.FONT_SIZE_SMALL), bg=AppStyles.BG_COLOR).grid(row=2, column=0, sticky="w", pady=(10,2))
+        self.search_var = tk.StringVar()
+        self.search_var.trace_add("write", self._on_search_changed) # Also catches pastes and clears
+        self.search_entry = ttk.Entry(self.controls_frame, textvariable=self.search_var, style=AppStyles.TTK_ENTRY_STYLE)
+        self.search_entry.grid(row=3, column=0, columnspan=3, sticky="ew", padx=(0,5))
+        self.search_entry.bind("<Escape>", lambda event: self.search_var.set(""))
+        self.search_after_id = None # Pending debounced search
         self.controls_frame.grid_columnconfigure(0, weight=1)
         self.controls_frame.grid_columnconfigure(1, weight=1)
         self.controls_frame.grid_columnconfigure(2, weight=1)
 
         # --- Task List Frame ---
         self.list_frame = ttk.Frame(self.master, padding=AppStyles.PADDING, style=AppStyles.TTK_FRAME_STYLE)
-        self.task_listbox = tk.Listbox(
+        # Only the rows on screen are formatted and drawn, so large lists stay fast.
+        # Shift/Ctrl-click selects several tasks.
+        self.task_listbox = VirtualTaskList(
             self.list_frame,
-            width=50,
             height=15,
             font=(AppStyles.FONT_FAMILY, AppStyles.FONT_SIZE_MEDIUM),
             bg=AppStyles.CARD_BG_COLOR,
             fg=AppStyles.TEXT_COLOR,
             selectbackground=AppStyles.PRIMARY_COLOR,
             selectforeground="#FFFFFF",
-            bd=0, # No border
-            highlightthickness=0, # No highlight border on focus
-            relief="flat",
-            activestyle='none' # No special style on active item
+            style=AppStyles.TTK_FRAME_STYLE
         )
-        self.task_listbox.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-
-        self.scrollbar = ttk.Scrollbar(self.list_frame, orient="vertical", command=self.task_listbox.yview)
-        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-        self.task_listbox.config(yscrollcommand=self.scrollbar.set)
-
-        # Map internal task IDs to listbox indices
-        self.task_id_map = {} # {listbox_index: task_id}
+        self.task_listbox.pack(fill=tk.BOTH, expand=True)
+
+        # Map listbox indices to internal task IDs
+        self.task_id_map = [] # task_id_map[listbox_index] == task_id
+        self.displayed_tasks = [] # Tasks in display order, formatted lazily by _format_task_row
+        self.displayed_keys = [] # Sort key of each displayed task, for finding rows with bisect
+        self.changes_since_idle = 0 # Rows patched since the app was last idle
+        self.reload_pending = False # A full reload is scheduled, so single changes can be skipped
+        # The filter/sort the list currently shows
+        self.view_category = None
+        self.view_sort_by = 'created_at'
+        self.view_include_completed = True
+        self.view_search_terms = [] # Words of the search box, empty when not searching
+        self.due_after_id = None # The timer for the next due-date change, see _schedule_due_timer()
+        self.due_timer_day = None
+        self.due_check_pending = False # A task changed, so the timer may have to fire sooner
 
         # --- Action Buttons Frame ---
         self.action_button_frame = ttk.Frame(self.master, padding=AppStyles.PADDING, style=AppStyles.TTK_FRAME_STYLE)
@@ -178,96 +301,222 @@ class TodoAppGUI:
         self.action_button_frame.pack(pady=(0, AppStyles.PADDING), fill=tk.X)
 
     def _load_tasks_to_listbox(self, event=None): # event parameter for combobox binding
-        self.task_listbox.delete(0, tk.END)
-        self.task_id_map = {} # Reset map
+        self.reload_pending = False
+        mark = metrics.timer('load_tasks_to_listbox')
 
         # Get filter/sort criteria
         selected_category = self.category_filter_combobox.get()
         if selected_category == "All" or not selected_category:
             selected_category = None # Pass None to get_tasks to signify no category filter
 
-        sort_by_mapping = {
-            "Creation Date": "created_at",
-            "Due Date": "due_date",
-            "Description": "description",
-            "Status": "completed"
-        }
-        current_sort_by = sort_by_mapping.get(self.sort_by_combobox.get(), 'created_at')
+        # Update category filter dropdown values
+        if not self._update_category_filter(selected_category):
+            selected_category = None # Previously selected category no longer exists
+
+        current_sort_by = self.SORT_BY_MAPPING.get(self.sort_by_combobox.get(), 'created_at')
         include_completed = self.include_completed_var.get()
+        search_query = self.search_var.get()
 
-        tasks = self.task_manager.get_tasks(
+        # An empty search returns the same tasks as get_tasks()
+        tasks = self.task_manager.search(
+            search_query,
             category=selected_category,
             include_completed=include_completed,
             sort_by=current_sort_by
         )
-
-        today = datetime.date.today()
-
-        for i, task in enumerate(tasks):
-            self.task_id_map[i] = task['id'] # Map listbox index to task ID
-
-            display_text = f"{task['description']}"
-            meta_info = []
-
-            # Add category if available
-            if task.get('category') and task['category'] != 'Uncategorized':
-                meta_info.append(f"Cat: {task['category']}")
-
-            # Add due date if available and check overdue status
-            if task.get('due_date'):
-                try:
-                    due_date_dt = datetime.datetime.strptime(task['due_date'], '%Y-%m-%d').date()
-                    if not task['completed'] and due_date_dt < today:
-                        meta_info.append(f"DUE: {task['due_date']} (OVERDUE!)")
-                    else:
-                        meta_info.append(f"Due: {task['due_date']}")
-                except ValueError:
-                    meta_info.append(f"Due: Invalid Date")
-
-            # Add creation date
-            if task.get('created_at'):
-                try:
-                    created_date_dt = datetime.datetime.fromisoformat(task['created_at']).date()
-                    meta_info.append(f"Created: {created_date_dt.strftime('%Y-%m-%d')}")
-                except ValueError:
-                    meta_info.append(f"Created: Invalid Date")
-
-            full_display_text = display_text
-            if meta_info:
-                full_display_text += f" ({', '.join(meta_info)})"
-
-            self.task_listbox.insert(tk.END, full_display_text)
-
-            # Apply styling based on task status and overdue
-            if task['completed']:
-                self.task_listbox.itemconfig(i, {'fg': AppStyles.COMPLETED_TEXT_COLOR})
-                self.task_listbox.itemconfigure(i, bg=AppStyles.BG_COLOR) # Light grey for completed background
-            elif task.get('due_date'):
-                 try:
-                    due_date_dt = datetime.datetime.strptime(task['due_date'], '%Y-%m-%d').date()
-                    if due_date_dt < today:
-                         self.task_listbox.itemconfig(i, {'fg': AppStyles.OVERDUE_COLOR})
-                         self.task_listbox.itemconfigure(i, bg="#FFEBEB") # Light red for overdue background
-                    else:
-                        self.task_listbox.itemconfig(i, {'fg': AppStyles.TEXT_COLOR})
-                        self.task_listbox.itemconfigure(i, bg=AppStyles.CARD_BG_COLOR) # Default white
-                 except ValueError:
-                    self.task_listbox.itemconfig(i, {'fg': AppStyles.TEXT_COLOR})
-                    self.task_listbox.itemconfigure(i, bg=AppStyles.CARD_BG_COLOR) # Default white
-            else:
-                self.task_listbox.itemconfig(i, {'fg': AppStyles.TEXT_COLOR})
-                self.task_listbox.itemconfigure(i, bg=AppStyles.CARD_BG_COLOR) # Default white
-
-
-        # Update category filter dropdown values
+        mark('query')
+
+        self.view_category = selected_category
+        self.view_sort_by = current_sort_by
+        self.view_include_completed = include_completed
+        self.view_search_terms = tokenize(search_query)
+        self.displayed_tasks = tasks
+        self.task_id_map = [task.id for task in tasks]
+        sort_key = SORT_KEYS[current_sort_by]
+        self.displayed_keys = [sort_key(task) for task in tasks]
+        mark('format')
+        self.task_listbox.set_rows(len(tasks), self._format_task_row)
+        mark('insert')
+
+    def _on_search_changed(self, *args):
+        # Wait for a pause in typing, so a burst of keystrokes runs a single search
+        if self.search_after_id is not None:
+            self.master.after_cancel(self.search_after_id)
+        self.search_after_id = self.master.after(self.SEARCH_DELAY_MS, self._run_search)
+
+    def _run_search(self):
+        self.search_after_id = None
+        self._load_tasks_to_listbox()
+
+    def _update_category_filter(self, selected_category):
+        """Refreshes the category dropdown. Returns False (and selects 'All') if selected_category is gone."""
         all_categories = self.task_manager.get_categories()
         self.category_filter_combobox['values'] = ['All'] + all_categories
         if selected_category is None: # If 'All' was selected or no filter previously
             self.category_filter_combobox.set('All')
-        elif selected_category not in all_categories and selected_category is not None:
-             # If previously selected category no longer exists, reset to 'All'
+        elif selected_category not in all_categories:
+            # If previously selected category no longer exists, reset to 'All'
             self.category_filter_combobox.set('All')
-            self._load_tasks_to_listbox() # Recurse to reload with 'All' filter
+            return False
+        return True
+
+    def _on_task_changed(self, event_type, task):
+        """TaskManager listener: patch only the affected row instead of reloading the whole list."""
+        if event_type in ('added', 'updated', 'loaded', 'reloaded') and not self.due_check_pending:
+            self.due_check_pending = True # A new due date may come before the timer
+            self.master.after_idle(self._schedule_due_timer)
+        if self.reload_pending:
+            return # The scheduled reload will pick this change up
+        if event_type in ('loaded', 'reloaded'):
+            self._schedule_reload() # A slice of tasks arrived from disk, or the backend changed wholesale
+            return
+        self.changes_since_idle += 1
+        if self.changes_since_idle == 1:
+            self.master.after_idle(self._reset_change_count)
+        if self.changes_since_idle > self.MAX_INCREMENTAL_CHANGES:
+            self._schedule_reload()
+            return
+
+        if event_type in ('added', 'removed'):
+            # Adds and deletes can create or remove categories
+            if not self._update_category_filter(self.view_category):
+                self._schedule_reload() # The filtered category is gone, show 'All'
+                return
+
+        if event_type == 'added':
+            self._insert_row(task)
+        elif event_type == 'removed':
+            self._remove_row(task, SORT_KEYS[self.view_sort_by](task))
+        elif event_type == 'updated':
+            self._update_row(task)
+        else: # 'overdue', 'due_soon' or 'not_due': only the styling changes, the row stays put
+            self._restyle_row(task)
+
+    def _reset_change_count(self):
+        self.changes_since_idle = 0
+
+    def _schedule_reload(self):
+        self.reload_pending = True
+        self.master.after_idle(self._load_tasks_to_listbox)
+
+    def _matches_view(self, task):
+        return ((self.view_category is None or task.category == self.view_category)
+                and (self.view_include_completed or not task.completed)
+                and (not self.view_search_terms or matches(self.view_search_terms, task.description)))
+
+    def _find_row(self, task, key):
+        """Returns the list index of task (whose sort key is key), or None if it isn't shown."""
+        start = bisect.bisect_left(self.displayed_keys, key)
+        end = bisect.bisect_right(self.displayed_keys, key, start)
+        try:
+            return self.task_id_map.index(task.id, start, end)
+        except ValueError:
+            return None
+
+    def _insert_row(self, task):
+        if not self._matches_view(task):
+            return
+        key = SORT_KEYS[self.view_sort_by](task)
+        index = bisect.bisect_left(self.displayed_keys, key)
+        end = bisect.bisect_right(self.displayed_keys, key, index)
+        if index < end:
+            # Among tasks with the same key, find its place the way get_tasks() orders them
+            position = self.task_manager.position(task)
+            while index < end:
+                middle = (index + end) // 2
+                if self.task_manager.position(self.displayed_tasks[middle]) < position:
+                    index = middle + 1
+                else:
+                    end = middle
+        self.displayed_tasks.insert(index, task)
+        self.task_id_map.insert(index, task.id)
+        self.displayed_keys.insert(index, key)
+        self.task_listbox.insert_row(index)
+
+    def _remove_row(self, task, key):
+        index = self._find_row(task, key)
+        if index is None:
+            return
+        del self.displayed_tasks[index]
+        del self.task_id_map[index]
+        del self.displayed_keys[index]
+        self.task_listbox.delete_row(index)
+
+    def _update_row(self, task):
+        # Only the completion status changes. It moves the row with its sort key, and with the
+        # task's position among equal keys when reopening an archived task moves it out of the archive
+        if self.view_sort_by == 'completed':
+            old_key = not task.completed
+        else:
+            old_key = SORT_KEYS[self.view_sort_by](task)
+        if self.view_sort_by == 'completed' or not self.view_include_completed:
+            self._remove_row(task, old_key)
+            self._insert_row(task)
+            return
+        index = self._find_row(task, old_key)
+        if index is None:
+            return
+        if self._in_place(index, task):
+            self.displayed_tasks[index] = task # Query backends hand out a fresh object per query
+            self.task_listbox.update_row(index)
+        else:
+            self._remove_row(task, old_key)
+            self._insert_row(task)
+
+    def _in_place(self, index, task):
+        """True if the row at index still sits where get_tasks() orders task among rows with the same key."""
+        key = self.displayed_keys[index]
+        position = self.task_manager.position(task)
+        if index > 0 and self.displayed_keys[index - 1] == key:
+            if self.task_manager.position(self.displayed_tasks[index - 1]) > position:
+                return False
+        if index + 1 < len(self.displayed_keys) and self.displayed_keys[index + 1] == key:
+            if self.task_manager.position(self.displayed_tasks[index + 1]) < position:
+                return False
+        return True
+
+    def _restyle_row(self, task):
+        index = self._find_row(task, SORT_KEYS[self.view_sort_by](task))
+        if index is not None:
+            self.displayed_tasks[index] = task
+            self.task_listbox.update_row(index)
+
+    def _format_task_row(self, index):
+        """Returns (text, fg, bg) for the row at index. Only called for rows that are on screen."""
+        task = self.displayed_tasks[index]
+        display_text = f"{task.description}"
+        meta_info = []
+
+        # Add category if available
+        if task.category and task.category != 'Uncategorized':
+            meta_info.append(f"Cat: {task.category}")
+
+        # Add due date if available and check overdue status (kept current by TaskManager's due-date timer)
+        due_state = self.task_manager.due_state(task)
+        if task.due_date:
+            due_text = task.due_date.strftime('%Y-%m-%d')
+            if due_state == 'overdue':
+                meta_info.append(f"DUE: {due_text} (OVERDUE!)")
+            elif due_state == 'due_soon':
+                meta_info.append(f"DUE: {due_text} (SOON)")
+            else:
+                meta_info.append(f"Due: {due_text}")
+
+        # Add creation date
+        meta_info.append(f"Created: {task.created_at.strftime('%Y-%m-%d')}")
+
+        full_display_text = display_text
+        if meta_info:
+            full_display_text += f" ({', '.join(meta_info)})"
+
+        # Apply styling based on task status and overdue
+        if task.completed:
+            return full_display_text, AppStyles.COMPLETED_TEXT_COLOR, AppStyles.BG_COLOR # Light grey for completed background
+        if due_state == 'overdue':
+            return full_display_text, AppStyles.OVERDUE_COLOR, "#FFEBEB" # Light red for overdue background
+        if due_state == 'due_soon':
+            return full_display_text, AppStyles.DUE_SOON_COLOR, "#FFF4E5" # Light orange for due soon background
+        return full_display_text, AppStyles.TEXT_COLOR, AppStyles.CARD_BG_COLOR # Default white
 
     def add_task(self):
         description = self.task_description_entry.get()
@@ -278,37 +527,37 @@ class TodoAppGUI:
             self.task_description_entry.delete(0, tk.END)
             self.task_category_entry.delete(0, tk.END)
             self.task_due_date_entry.delete(0, tk.END)
-            self._load_tasks_to_listbox()
         else:
             messagebox.showwarning("Input Error", "Task description cannot be empty!")
 
+    def _get_selected_task_ids(self):
+        return [self.task_id_map[index] for index in self.task_listbox.curselection() if index < len(self.task_id_map)]
+
     def delete_selected_task(self):
-        try:
-            selected_index = self.task_listbox.curselection()[0]
-            task_id_to_delete = self.task_id_map.get(selected_index)
-
-            if task_id_to_delete:
-                if messagebox.askyesno("Confirm Delete", "Are you sure you want to delete the selected task?"):
-                    if self.task_manager.delete_task(task_id_to_delete):
-                        self._load_tasks_to_listbox()
-                    else:
-                        messagebox.showerror("Error", "Failed to delete task.")
+        task_ids_to_delete = self._get_selected_task_ids()
+
+        if task_ids_to_delete:
+            if len(task_ids_to_delete) == 1:
+                prompt = "Are you sure you want to delete the selected task?"
             else:
-                messagebox.showwarning("Selection Error", "Please select a task to delete.")
-        except IndexError:
+                prompt = f"Are you sure you want to delete the {len(task_ids_to_delete)} selected tasks?"
+            if messagebox.askyesno("Confirm Delete", prompt):
+                # delete_tasks persists the whole selection with a single write
+                if not self.task_manager.delete_tasks(task_ids_to_delete):
+                    messagebox.showerror("Error", "Failed to delete task.")
+        else:
             messagebox.showwarning("Selection Error", "Please select a task to delete.")
 
     def toggle_selected_task_status(self):
-        try:
-            selected_index = self.task_listbox.curselection()[0]
-            task_id_to_toggle = self.task_id_map.get(selected_index)
-
-            if task_id_to_toggle:
-                if self.task_manager.toggle_task_status(task_id_to_toggle):
-                    self._load_tasks_to_listbox()
-                else:
-                    messagebox.showerror("Error", "Failed to toggle task status.")
-            else:
-                messagebox.showwarning("Selection Error", "Please select a task to toggle its status.")
-        except IndexError:
-            messagebox.showwarning("Selection Error", "Please select a task to toggle its status.")
\ No newline at end of file
+        task_ids_to_toggle = self._get_selected_task_ids()
+
+        if task_ids_to_toggle:
+            toggled = 0
+            with self.task_manager.batch(): # One write for the whole selection
+                for task_id in task_ids_to_toggle:
+                    if self.task_manager.toggle_task_status(task_id):
+                        toggled += 1
+            if not toggled:
+                messagebox.showerror("Error", "Failed to toggle task status.")
+        else:
+            messagebox.showwarning("Selection Error", "Please select a task to toggle its status.")
@@ -0,0 +1,97 @@
+# journal.py
+import json
+import os
+
+class TaskJournal:
+    """
+    Append-only log of task mutations kept next to the tasks snapshot file.
+    Each mutation is stored as one compact JSON record per line, so a change
+    costs a single small append instead of rewriting the whole snapshot.
+    """
+    def __init__(self, path):
+        self.path = path
+        self._file = None
+        try:
+            self.size = os.path.getsize(path) # Bytes currently in the log
+        except OSError:
+            self.size = 0
+
+    def append(self, record):
+        """Appends a single record to the log."""
+        self.append_many([record])
+
+    def append_many(self, records):
+        """Appends several records with one write call."""
+        data = "".join(json.dumps(record, separators=(',', ':')) + "\n" for record in records).encode('utf-8')
+        if not data:
+            return
+        if self._file is None:
+            # Binary, so no platform newline translation: size must count the bytes on disk
+            self._file = open(self.path, 'ab')
+        self._file.write(data)
+        self._file.flush() # Hand the record to the OS right away so a crash of the app doesn't lose it
+        self.size += len(data)
+
+    def replay(self):
+        """
+        Returns all complete records in the log, oldest first.
+        A torn or corrupted tail (e.g. from a crash mid-append) is dropped and
+        truncated from the file so later appends start on a clean line.
+        """
+        try:
+            with open(self.path, 'rb') as f:
+                data = f.read()
+        except FileNotFoundError:
+            return []
+
+        records, offset = self._parse(data)
+        if offset < len(data):
+            print(f"Warning: discarding {len(data) - offset} bytes of incomplete journal data in {self.path}.")
+            self.close()
+            with open(self.path, 'r+b') as f:
+                f.truncate(offset)
+        self.size = offset
+        return records
+
+    def records_from(self, offset):
+        """
+        Returns (records, end) for the complete records from byte offset on, e.g. the ones
+        another process appended since this one last read the log. end is the offset to
+        continue from next time. Unlike replay() nothing is truncated.
+        """
+        try:
+            with open(self.path, 'rb') as f:
+                f.seek(offset)
+                data = f.read()
+        except FileNotFoundError:
+            return [], 0
+        records, consumed = self._parse(data)
+        return records, offset + consumed
+
+    @staticmethod
+    def _parse(data):
+        """Returns (records, bytes consumed) for the complete, valid lines at the start of data."""
+        records = []
+        offset = 0
+        while offset < len(data):
+            end = data.find(b"\n", offset)
+            if end == -1:
+                break # Last line was never finished
+            try:
+                records.append(json.loads(data[offset:end].decode('utf-8')))
+            except (ValueError, UnicodeDecodeError):
+                break # Anything after a damaged record can't be trusted
+            offset = end + 1
+        return records, offset
+
+    def reset(self):
+        """Empties the log, e.g. after its records were folded into a new snapshot."""
+        self.close()
+        with open(self.path, 'wb'):
+            pass
+        self.size = 0
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
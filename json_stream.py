@@ -0,0 +1,62 @@
+# json_stream.py
+import json
+
+_WHITESPACE = ' \t\r\n'
+_NUMBER_CHARS = '0123456789+-.eE' # Characters that can continue a number
+
+def iter_json_array(f, chunk_size=64 * 1024):
+    """
+    Yields the elements of the top-level JSON array in file object f one at a time,
+    reading the file in chunks instead of loading it all at once.
+    Raises json.JSONDecodeError if the file isn't a well-formed array.
+    """
+    decoder = json.JSONDecoder()
+    buffer = ''
+    pos = 0
+    eof = False
+
+    def next_char():
+        # Returns the next non-whitespace character (without consuming it), reading more input as needed
+        nonlocal buffer, pos, eof
+        while True:
+            while pos < len(buffer) and buffer[pos] in _WHITESPACE:
+                pos += 1
+            if pos < len(buffer) or eof:
+                return buffer[pos] if pos < len(buffer) else ''
+            chunk = f.read(chunk_size)
+            buffer = buffer[pos:] + chunk
+            pos = 0
+            eof = not chunk
+
+    if next_char() != '[':
+        raise json.JSONDecodeError("Expecting '['", buffer, pos)
+    pos += 1
+    if next_char() == ']':
+        return
+    while True:
+        next_char()
+        while True:
+            try:
+                element, end = decoder.raw_decode(buffer, pos)
+                # A number might continue in the next chunk if it runs to the end of the buffer,
+                # or stops at a character that belongs to it ("2." before "5", "2.5e" before "3")
+                number = isinstance(element, (int, float)) and not isinstance(element, bool)
+                if eof or (end < len(buffer) and not (number and buffer[end] in _NUMBER_CHARS)):
+                    break
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+            # The element continues in the next chunk
+            chunk = f.read(chunk_size)
+            buffer = buffer[pos:] + chunk
+            pos = 0
+            eof = not chunk
+        pos = end
+        yield element
+
+        separator = next_char()
+        pos += 1
+        if separator == ']':
+            return
+        if separator != ',':
+            raise json.JSONDecodeError("Expecting ',' delimiter", buffer, pos - 1)
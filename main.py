@@ -1,16 +1,56 @@
 # main.py
+import argparse
+import atexit
 import tkinter as tk
 import os
-from task_manager import TaskManager
+from api_server import DEFAULT_PORT, TaskAPIServer
+from metrics import metrics
+from storage import SQLiteStorage
+from task_manager import DEFAULT_ARCHIVE_AFTER_DAYS, TaskManager
 from gui import TodoAppGUI
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Super To-Do List")
+    parser.add_argument("--sqlite", action="store_true",
+                        help="keep tasks in an SQLite database (tasks.db) instead of tasks.json")
+    parser.add_argument("--profile", action="store_true",
+                        help="collect timings of loading, saving and queries; press F12 to view them "
+                             "(setting the TODO_PROFILE environment variable does the same)")
+    parser.add_argument("--profile-output", metavar="FILE",
+                        help="with --profile, write the collected timings to FILE as JSON on exit")
+    parser.add_argument("--api", action="store_true",
+                        help="also serve a local HTTP/JSON API (127.0.0.1 only) for other tools")
+    parser.add_argument("--api-port", type=int, default=DEFAULT_PORT, help=f"port for --api (default {DEFAULT_PORT})")
+    parser.add_argument("--archive-after", type=int, default=DEFAULT_ARCHIVE_AFTER_DAYS, metavar="DAYS",
+                        help="move tasks completed more than DAYS days ago to tasks.json.archive.gz "
+                             f"(default {DEFAULT_ARCHIVE_AFTER_DAYS}, -1 never archives)")
+    parser.add_argument("--columnar", action="store_true",
+                        help="also keep tasks as columns, so sorting and filtering very large lists "
+                             "is faster (with NumPy installed)")
+    args = parser.parse_args()
+
+    if args.profile or args.profile_output:
+        metrics.enable()
+    if args.profile_output and metrics.enabled:
+        atexit.register(metrics.dump, args.profile_output)
+
     root = tk.Tk()
 
     # Ensure tasks.json is in the same directory as app.py
     basedir = os.path.abspath(os.path.dirname(__file__))
     tasks_file_path = os.path.join(basedir, "tasks.json")
 
-    task_manager = TaskManager(filename=tasks_file_path)
+    if args.sqlite:
+        # Queries run in SQL and every change is a single-row update, so nothing needs loading up front
+        task_manager = TaskManager(storage=SQLiteStorage(os.path.join(basedir, "tasks.db")))
+    else:
+        # Saving happens on a background thread; the GUI flushes it when the window closes.
+        # Tasks are read lazily, so the window paints before a large file is fully loaded.
+        # Long-completed tasks are archived, so loading and saving scale with the active ones.
+        task_manager = TaskManager(filename=tasks_file_path, journal=True, write_behind=True, lazy=True,
+                                   archive_after=args.archive_after if args.archive_after >= 0 else None,
+                                   columnar=args.columnar)
     app = TodoAppGUI(root, task_manager)
-    root.mainloop()
\ No newline at end of file
+    if args.api:
+        TaskAPIServer(task_manager, port=args.api_port).start_in_thread()
+    root.mainloop()
@@ -0,0 +1,94 @@
+# metrics.py
+import json
+import os
+import threading
+import time
+
+def _noop(phase=None):
+    pass
+
+class Metrics:
+    """
+    Opt-in counters and timings for the hot paths. Collected names:
+
+        load_tasks           reading tasks from disk, per load_more() slice (load_tasks.count: tasks read)
+        save_tasks           one save to the storage backend (save_tasks.bytes: bytes written)
+        load_archive         reading archived tasks, the first time a query needs them
+                             (load_archive.count: tasks read)
+        get_tasks.filter     picking the matching tasks
+        get_tasks.sort       sorting them
+        get_tasks.sql        the whole query, with a query backend such as SQLite
+        get_tasks.columnar   filtering and sorting the loaded tasks, with columnar=True
+                             (get_tasks.sort: sorting archived tasks in, if any)
+        load_tasks_to_listbox.query / .format / .insert
+                             running the query, preparing the rows, handing them to the
+                             list widget (which formats and draws the visible ones)
+
+    Everything is a no-op while enabled is False, so instrumented code only pays a call.
+    """
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self._lock = threading.Lock() # Saves are timed on the background writer thread
+        self._stats = {} # {name: [count, total, max]}
+
+    def enable(self):
+        self.enabled = True
+
+    def timer(self, name):
+        """
+        Starts timing and returns mark(phase=None). Each mark records the time since the
+        previous mark (or since timer() was called) as 'name.phase', or as 'name' without a phase.
+        """
+        if not self.enabled:
+            return _noop
+        last = time.perf_counter()
+
+        def mark(phase=None):
+            nonlocal last
+            now = time.perf_counter()
+            self.observe(f"{name}.{phase}" if phase else name, now - last)
+            last = now
+        return mark
+
+    def observe(self, name, value):
+        """Records one value (seconds for timings, or a size such as bytes) under name."""
+        if not self.enabled:
+            return
+        with self._lock:
+            stat = self._stats.get(name)
+            if stat is None:
+                self._stats[name] = [1, value, value]
+            else:
+                stat[0] += 1
+                stat[1] += value
+                if value > stat[2]:
+                    stat[2] = value
+
+    def snapshot(self):
+        """Returns {name: {'count', 'total', 'mean', 'max'}} for everything recorded so far."""
+        with self._lock:
+            return {name: {"count": count, "total": total, "mean": total / count, "max": maximum}
+                    for name, (count, total, maximum) in sorted(self._stats.items())}
+
+    def reset(self):
+        with self._lock:
+            self._stats = {}
+
+    def dump(self, path):
+        """Writes snapshot() to path as JSON."""
+        with open(path, 'w') as f:
+            json.dump(self.snapshot(), f, indent=4)
+
+    def format_report(self):
+        """Returns the metrics as a plain-text table; timings are shown in milliseconds."""
+        lines = [f"{'metric':<32} {'count':>7} {'total':>11} {'mean':>10} {'max':>10}"]
+        for name, stat in self.snapshot().items():
+            if name.endswith(('.bytes', '.count')):
+                values = [f"{stat['total']:>11.0f}", f"{stat['mean']:>10.0f}", f"{stat['max']:>10.0f}"]
+            else:
+                values = [f"{stat['total'] * 1000:>9.1f}ms", f"{stat['mean'] * 1000:>8.2f}ms", f"{stat['max'] * 1000:>8.2f}ms"]
+            lines.append(f"{name:<32} {stat['count']:>7} " + " ".join(values))
+        return "\n".join(lines)
+
+# Shared by TaskManager and the GUI. Setting TODO_PROFILE (or main.py --profile) turns it on.
+metrics = Metrics(enabled=bool(os.environ.get("TODO_PROFILE")))
@@ -0,0 +1,50 @@
+# metrics_panel.py
+import tkinter as tk
+from tkinter import filedialog, ttk
+from metrics import metrics
+from styles import AppStyles
+
+class MetricsPanel(tk.Toplevel):
+    """Debug window showing the collected metrics, refreshed every second."""
+    REFRESH_MS = 1000
+
+    def __init__(self, master):
+        super().__init__(master)
+        self.title("Metrics")
+        self.geometry("620x360")
+        self.config(bg=AppStyles.BG_COLOR)
+
+        button_frame = ttk.Frame(self, padding=(5, 5, 5, 0), style=AppStyles.TTK_FRAME_STYLE)
+        ttk.Button(button_frame, text="Dump to File...", command=self._dump).pack(side=tk.LEFT)
+        ttk.Button(button_frame, text="Reset", command=self._reset).pack(side=tk.LEFT, padx=(5, 0))
+        button_frame.pack(fill=tk.X)
+
+        self.report_text = tk.Text(self, font=("Courier", AppStyles.FONT_SIZE_XSMALL), wrap=tk.NONE,
+                                   bg=AppStyles.CARD_BG_COLOR, fg=AppStyles.TEXT_COLOR, relief=tk.FLAT)
+        self.report_text.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+        self._refresh_id = None
+        self._refresh()
+
+    def _refresh(self):
+        self.report_text.config(state=tk.NORMAL)
+        self.report_text.delete("1.0", tk.END)
+        self.report_text.insert("1.0", metrics.format_report())
+        self.report_text.config(state=tk.DISABLED)
+        self._refresh_id = self.after(self.REFRESH_MS, self._refresh)
+
+    def _dump(self):
+        path = filedialog.asksaveasfilename(parent=self, defaultextension=".json",
+                                            filetypes=[("JSON files", "*.json")], initialfile="metrics.json")
+        if path:
+            metrics.dump(path)
+
+    def _reset(self):
+        metrics.reset()
+        self.after_cancel(self._refresh_id)
+        self._refresh()
+
+    def destroy(self):
+        if self._refresh_id is not None:
+            self.after_cancel(self._refresh_id)
+            self._refresh_id = None
+        super().destroy()
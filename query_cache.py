@@ -0,0 +1,43 @@
+# query_cache.py
+from collections import OrderedDict
+
+class QueryCache:
+    """
+    Bounded LRU cache of query results.
+
+    Every entry is tagged with the data version it was computed at. Call invalidate() on
+    every change: it bumps the version, so a result computed while the data was changing
+    is never served as current.
+    """
+    def __init__(self, max_entries=32):
+        self.max_entries = max_entries
+        self.version = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict() # {key: (version, result)}, least recently used first
+
+    def get(self, key):
+        """Returns the cached result for key, or None if there is no current one."""
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] == self.version:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+        self.misses += 1
+        return None
+
+    def put(self, key, version, result):
+        """Stores result, computed when the data was at version (read self.version before computing)."""
+        if version != self.version or self.max_entries <= 0:
+            return # The data changed while computing; the result is already stale
+        self._entries[key] = (version, result)
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self):
+        self.version += 1
+        self._entries.clear() # Every entry is stale now; don't keep their results alive
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "entries": len(self._entries), "version": self.version}
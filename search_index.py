@@ -0,0 +1,98 @@
+# search_index.py
+import bisect
+import re
+
+# Runs of letters and digits; matches how SQLite's FTS5 splits words
+_TOKEN_RE = re.compile(r'[^\W_]+')
+# Prefixes up to this long get their own id sets, so the broad one- and two-letter
+# searches (the first keystrokes) don't have to merge the sets of thousands of words
+SHORT_PREFIX_LENGTH = 2
+# Below this many new words they are inserted one by one, above it the word list is re-sorted
+_MAX_INSORTS = 64
+
+def tokenize(text):
+    """Splits text into lowercase words."""
+    return _TOKEN_RE.findall(text.lower())
+
+def matches(terms, text):
+    """True if every term is a prefix of some word in text (the same rule SearchIndex.match uses)."""
+    words = tokenize(text)
+    return all(any(word.startswith(term) for word in words) for term in terms)
+
+class SearchIndex:
+    """
+    Inverted index from the words of task descriptions to task ids.
+
+    Terms are matched as word prefixes, so match(['gro', 'mil']) finds "Buy groceries and milk".
+    Words are kept in a sorted list, so all words sharing a longer prefix are found with two
+    bisects; prefixes of up to SHORT_PREFIX_LENGTH letters are looked up directly.
+    """
+    def __init__(self):
+        self._postings = {} # {word: set of task ids}; emptied sets are kept, the word may come back
+        self._short_prefixes = {} # {prefix: set of task ids} for prefixes up to SHORT_PREFIX_LENGTH
+        self._words = [] # Sorted words
+        self._new_words = [] # Words not in _words yet, merged in by the next match()
+
+    @staticmethod
+    def _split(text):
+        words = set(tokenize(text))
+        prefixes = {word[:length] for word in words for length in range(1, SHORT_PREFIX_LENGTH + 1)}
+        return words, prefixes
+
+    def add(self, task_id, text):
+        words, prefixes = self._split(text)
+        for word in words:
+            ids = self._postings.get(word)
+            if ids is None:
+                ids = self._postings[word] = set()
+                self._new_words.append(word)
+            ids.add(task_id)
+        for prefix in prefixes:
+            ids = self._short_prefixes.get(prefix)
+            if ids is None:
+                ids = self._short_prefixes[prefix] = set()
+            ids.add(task_id)
+
+    def remove(self, task_id, text):
+        """Removes task_id from the index. Does nothing if it was never added."""
+        words, prefixes = self._split(text)
+        for word in words:
+            ids = self._postings.get(word)
+            if ids is not None:
+                ids.discard(task_id)
+        for prefix in prefixes:
+            ids = self._short_prefixes.get(prefix)
+            if ids is not None:
+                ids.discard(task_id)
+
+    def _sorted_words(self):
+        if self._new_words:
+            if len(self._new_words) > _MAX_INSORTS:
+                self._words = sorted(self._postings) # E.g. right after loading
+            else:
+                for word in self._new_words:
+                    bisect.insort(self._words, word)
+            self._new_words = []
+        return self._words
+
+    def _prefix_ids(self, prefix):
+        """Returns the ids of tasks with a word starting with prefix (possibly a shared set; don't modify it)."""
+        if len(prefix) <= SHORT_PREFIX_LENGTH:
+            return self._short_prefixes.get(prefix, set())
+        words = self._sorted_words()
+        start = bisect.bisect_left(words, prefix)
+        end = bisect.bisect_left(words, prefix[:-1] + chr(ord(prefix[-1]) + 1), start)
+        postings = self._postings
+        if end - start == 1:
+            return postings[words[start]]
+        return set().union(*[postings[word] for word in words[start:end]])
+
+    def match(self, terms):
+        """Returns the set of task ids whose text has a word starting with each of terms (don't modify it)."""
+        result = None
+        # Smaller sets first, so each intersection stays cheap
+        for ids in sorted((self._prefix_ids(term) for term in terms), key=len):
+            result = ids if result is None else result.intersection(ids)
+            if not result:
+                break
+        return result if result is not None else set()
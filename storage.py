@@ -0,0 +1,547 @@
+# storage.py
+import contextlib
+import datetime
+import json
+import os
+import sqlite3
+import uuid
+from archive import TaskArchive
+from file_lock import FileLock, file_signature
+from journal import TaskJournal
+from json_stream import iter_json_array
+from task import Task, DATE_FORMAT, parse_due_date
+
+# Once the journal grows past this many bytes it is folded into a fresh tasks.json snapshot
+DEFAULT_COMPACT_THRESHOLD = 1024 * 1024
+
+class TaskStorage:
+    """
+    Where TaskManager keeps its tasks. There are two kinds of backends:
+
+    * Resident backends (resident = True) are read into memory with iter_tasks(), and
+      TaskManager answers every query itself. Changes are handed to save() as journal-style
+      records ({"op": "add" | "delete" | "set" | "batch", ...}).
+    * Query backends (resident = False) keep the tasks on disk and answer queries themselves
+      (get, query, categories, ...). TaskManager calls insert/delete/set_completed for each
+      change and save() to commit them.
+    """
+    resident = True
+    # True if save() writes a full snapshot, so every task must be loaded before saving
+    needs_full_snapshot = False
+    # TaskArchive holding tasks moved out of the stored ones, or None if the backend has none
+    archive = None
+
+    def iter_tasks(self, streaming=False):
+        """Yields every stored task as a dict in the tasks.json schema."""
+        raise NotImplementedError
+
+    def save(self, records, snapshot, force_snapshot=False):
+        """
+        Persists the given change records. snapshot is a callable returning every task as a
+        dict, or None while some tasks are not loaded yet (full rewrites are then postponed).
+        Returns the number of bytes written, or None if the backend can't tell.
+        """
+        raise NotImplementedError
+
+    def wants_snapshot(self):
+        """True if the backend would like a full snapshot written, e.g. after migrating old data."""
+        return False
+
+    def read_changes(self):
+        """
+        Returns what other processes saved since this one last read or wrote the storage:
+        None if nothing changed, ('records', [record, ...]) with the new change records,
+        ('tasks', [task dict, ...]) with every stored task, or ('unknown', None) if the
+        backend can only tell that something changed. Cheap when nothing changed, so it can be polled.
+        """
+        return None
+
+    def rollback(self):
+        """Discards changes that haven't been saved yet (used when a batch fails)."""
+
+    def locked(self):
+        """Context manager keeping other processes from writing the storage while it is held."""
+        return contextlib.nullcontext()
+
+    def close(self):
+        """Releases files and connections."""
+
+
+class JSONFileStorage(TaskStorage):
+    """
+    Tasks stored as a JSON array in a single file (tasks.json).
+
+    With journal=True every change is appended as one record to '<filename>.journal'
+    instead of rewriting the whole file; the journal is compacted into a new snapshot
+    once it grows past compact_threshold bytes.
+
+    Archived tasks are kept apart in '<filename>.archive.gz' (see archive.py), so they
+    don't weigh on loading and saving.
+
+    Several processes may share the files: every read and write holds an advisory lock on
+    '<filename>.lock', and read_changes() picks up what the others saved. A snapshot never
+    overwrites changes this process hasn't read yet; see save().
+    """
+    def __init__(self, filename="tasks.json", journal=False, compact_threshold=DEFAULT_COMPACT_THRESHOLD):
+        self.filename = filename
+        self.journal = TaskJournal(filename + ".journal") if journal else None
+        self.compact_threshold = compact_threshold
+        self.needs_full_snapshot = self.journal is None
+        self.migrated = False # Set when loading had to backfill missing fields
+        self.archive = TaskArchive(filename + ".archive.gz")
+        self._lock = FileLock(filename + ".lock")
+        # What memory reflects: tasks.json as of this signature plus this many bytes of the journal
+        self._snapshot_signature = None
+        self._journal_offset = 0
+
+    def iter_tasks(self, streaming=False):
+        # The snapshot is opened and the journal read under the lock, so both are from the same moment.
+        # Records appended from now on are already reflected in memory.
+        with self._lock:
+            f = self._open_snapshot()
+            self._snapshot_signature = file_signature(self.filename)
+            journal_changes = self._read_journal()
+        return self._iter_stored_tasks(f, journal_changes, streaming)
+
+    def _open_snapshot(self):
+        try:
+            return open(self.filename, 'r')
+        except FileNotFoundError:
+            return None
+
+    def _iter_stored_tasks(self, f, journal_changes, streaming):
+        """
+        Yields task dicts from the open tasks.json snapshot f (None if there is none) with the
+        journal changes applied on top, backfilling fields that older files don't have.
+        """
+        replaced, completed = journal_changes
+        if f is not None:
+            with f:
+                try:
+                    stored_tasks = iter_json_array(f) if streaming else json.load(f)
+                    for task in stored_tasks:
+                        self._backfill(task)
+                        task_id = task['id']
+                        if task_id in replaced:
+                            task = replaced.pop(task_id)
+                            if task is None:
+                                continue # Deleted after the snapshot was written
+                        elif task_id in completed:
+                            task['completed'], task['completed_at'] = completed[task_id]
+                        yield task
+                except json.JSONDecodeError:
+                    print("Warning: tasks.json is corrupted or empty. Starting with the tasks read so far.")
+        # Tasks added after the snapshot was written
+        for task in replaced.values():
+            if task is not None:
+                yield task
+
+    def _backfill(self, task):
+        # Ensure all loaded tasks have a 'created_at' and 'id' for backward compatibility
+        if not all(key in task for key in ('id', 'created_at', 'category', 'due_date')):
+            self.migrated = True
+        if 'id' not in task:
+            task['id'] = str(uuid.uuid4())
+        if 'created_at' not in task:
+            task['created_at'] = datetime.datetime.now().isoformat()
+        if 'category' not in task: # Add default category
+            task['category'] = 'Uncategorized'
+        if 'due_date' not in task: # Add default due_date
+            task['due_date'] = None
+        task.setdefault('completed_at', None) # Not recorded before archiving; nothing to write back
+
+    def _read_journal(self):
+        """
+        Folds the journal into ({task_id: task dict, or None if deleted}, {task_id: (completed, completed_at)}),
+        so it can be applied while the snapshot streams past. Replaying is idempotent.
+        """
+        if self.journal is None:
+            return {}, {}
+        journal_changes = self._fold(self.journal.replay())
+        self._journal_offset = self.journal.size
+        return journal_changes
+
+    @staticmethod
+    def _fold(records):
+        """Folds change records into ({task_id: task dict, or None if deleted}, {task_id: (completed, completed_at)})."""
+        replaced = {}
+        completed = {}
+
+        def apply(record):
+            op = record.get('op')
+            if op == 'add':
+                replaced[record['task']['id']] = record['task']
+            elif op == 'delete':
+                replaced[record['id']] = None
+            elif op == 'set':
+                task = replaced.get(record['id'])
+                if task is not None:
+                    task['completed'] = record['completed']
+                    task['completed_at'] = record.get('completed_at')
+                elif record['id'] not in replaced:
+                    completed[record['id']] = (record['completed'], record.get('completed_at'))
+            elif op == 'batch':
+                for sub_record in record['ops']:
+                    apply(sub_record)
+
+        for record in records:
+            apply(record)
+        return replaced, completed
+
+    def _journal_size(self):
+        try:
+            return os.path.getsize(self.journal.path)
+        except OSError:
+            return 0
+
+    def locked(self):
+        return self._lock
+
+    def _in_sync(self):
+        """True if no other process wrote the files since this one last read or wrote them (stats only)."""
+        if file_signature(self.filename) != self._snapshot_signature:
+            return False
+        return self.journal is None or self._journal_size() == self._journal_offset
+
+    def read_changes(self):
+        if self._in_sync():
+            return None
+        with self._lock:
+            if file_signature(self.filename) != self._snapshot_signature or self.journal is None:
+                # Rewritten by another process (a save or a compaction): only a full read tells what changed
+                return 'tasks', list(self.iter_tasks())
+            records, self._journal_offset = self.journal.records_from(self._journal_offset)
+            return 'records', records
+
+    def wants_snapshot(self):
+        # Journal records refer to task ids, so backfilled ids must reach disk before they are replayed again
+        return self.migrated or (self.journal is not None and self.journal.size > self.compact_threshold)
+
+    def save(self, records, snapshot, force_snapshot=False):
+        with self._lock:
+            if self.journal is None:
+                if self._in_sync():
+                    return self._write_snapshot(snapshot())
+                return self._write_merged_snapshot(records)
+            journal_size = self.journal.size = self._journal_size() # Other processes may have appended
+            in_sync = journal_size == self._journal_offset and file_signature(self.filename) == self._snapshot_signature
+            self.journal.append_many(records)
+            written = self.journal.size - journal_size
+            if in_sync:
+                self._journal_offset = self.journal.size
+            # Otherwise read_changes() returns the other processes' records followed by ours;
+            # replaying is idempotent, so applying ours a second time changes nothing.
+            if snapshot is not None and (force_snapshot or self.migrated or self.journal.size > self.compact_threshold):
+                if in_sync: # A snapshot of memory would drop the changes memory doesn't have yet
+                    # Replaying the journal is idempotent, so records saved after this snapshot may safely follow it
+                    written += self._write_snapshot(snapshot())
+            return written
+
+    def _write_merged_snapshot(self, records):
+        # Another process saved tasks.json since we read it: apply our changes to its version
+        # instead of overwriting it. Memory gets the other process's changes from read_changes().
+        tasks = list(self._iter_stored_tasks(self._open_snapshot(), self._fold(records), False))
+        written = self._write_snapshot(tasks)
+        self._snapshot_signature = None # Still differs from the file, so read_changes() reports it
+        return written
+
+    def _write_snapshot(self, snapshot):
+        # Write to a temporary file and swap it in, so a crash never leaves a half-written tasks.json
+        tmp_filename = self.filename + ".tmp"
+        with open(tmp_filename, 'w') as f:
+            json.dump(snapshot, f, indent=4)
+            f.flush()
+            os.fsync(f.fileno())
+            written = f.tell()
+        os.replace(tmp_filename, self.filename)
+        self._snapshot_signature = file_signature(self.filename)
+        self.migrated = False
+        if self.journal:
+            self.journal.reset() # Everything in the journal is now part of the snapshot
+            self._journal_offset = 0
+        return written
+
+    def close(self):
+        if self.journal is not None:
+            self.journal.close()
+
+
+class SQLiteStorage(TaskStorage):
+    """
+    Tasks stored in an SQLite database, one row per task.
+
+    Filtering, sorting and category queries run in SQL on indexed columns, and each change
+    is a single-row INSERT, UPDATE or DELETE, so the task list never has to fit in memory.
+    """
+    resident = False
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS tasks (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT, -- Insertion order, breaks ties like the in-memory store
+            id TEXT NOT NULL UNIQUE,
+            description TEXT NOT NULL,
+            description_key TEXT NOT NULL, -- description.lower(), for sorting
+            completed INTEGER NOT NULL DEFAULT 0,
+            created_at TEXT NOT NULL,
+            category TEXT NOT NULL,
+            due_date TEXT,
+            completed_at TEXT
+        );
+        CREATE INDEX IF NOT EXISTS tasks_category ON tasks (category, completed);
+        CREATE INDEX IF NOT EXISTS tasks_due_date ON tasks (due_date);
+        CREATE INDEX IF NOT EXISTS tasks_completed ON tasks (completed);
+        CREATE INDEX IF NOT EXISTS tasks_created_at ON tasks (created_at);
+        CREATE INDEX IF NOT EXISTS tasks_description_key ON tasks (description_key);
+    """
+    # Full-text index over descriptions for search(), kept in sync by triggers. Diacritics are kept,
+    # like SearchIndex keeps them: "cafe" doesn't find "Café" with either backend.
+    FTS_SCHEMA = """
+        CREATE VIRTUAL TABLE tasks_fts USING fts5(description, content='tasks', content_rowid='seq',
+                                                  tokenize="unicode61 remove_diacritics 0");
+        CREATE TRIGGER tasks_fts_insert AFTER INSERT ON tasks BEGIN
+            INSERT INTO tasks_fts (rowid, description) VALUES (new.seq, new.description);
+        END;
+        CREATE TRIGGER tasks_fts_delete AFTER DELETE ON tasks BEGIN
+            INSERT INTO tasks_fts (tasks_fts, rowid, description) VALUES ('delete', old.seq, old.description);
+        END;
+        INSERT INTO tasks_fts (tasks_fts) VALUES ('rebuild');
+    """
+    DROP_FTS_SCHEMA = """
+        DROP TRIGGER IF EXISTS tasks_fts_insert;
+        DROP TRIGGER IF EXISTS tasks_fts_delete;
+        DROP TABLE tasks_fts;
+    """
+    COLUMNS = "id, description, completed, created_at, category, due_date, completed_at"
+    # Same orderings as SORT_KEYS in task_manager.py
+    ORDER_BY = {
+        'created_at': "created_at, seq",
+        'due_date': "due_date IS NULL, due_date, seq",
+        'description': "description_key, seq",
+        'completed': "completed, seq",
+    }
+    # Sort columns for iter_query(), whose order breaks ties by id (like TaskManager.iter_tasks)
+    SORT_COLUMNS = {
+        'created_at': "created_at",
+        'due_date': "due_date",
+        'description': "description_key",
+        'completed': "completed",
+    }
+
+    def __init__(self, path="tasks.db"):
+        self.path = path
+        # TaskManager serializes access with its own lock, so the connection may be shared across threads
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL") # WAL keeps this crash-safe; only the last commits may be lost on power loss
+        self.connection.executescript(self.SCHEMA)
+        if not self._has_column("tasks", "completed_at"): # Databases made before tasks had it
+            self.connection.execute("ALTER TABLE tasks ADD COLUMN completed_at TEXT")
+            self.connection.commit()
+        self.has_fts = self._has_table("tasks_fts")
+        if self.has_fts and "remove_diacritics" not in self._table_sql("tasks_fts"):
+            # Made with the default tokenizer, which strips diacritics; index again with the current one
+            self.connection.executescript(self.DROP_FTS_SCHEMA)
+            self.has_fts = False
+        if not self.has_fts:
+            try:
+                self.connection.executescript(self.FTS_SCHEMA)
+                self.has_fts = True
+            except sqlite3.OperationalError:
+                pass # SQLite built without FTS5; search() falls back to scanning with LIKE
+        self._data_version = self._read_data_version()
+
+    def _read_data_version(self):
+        # Changes whenever another connection commits; this connection's own commits leave it alone
+        return self.connection.execute("PRAGMA data_version").fetchone()[0]
+
+    def _has_table(self, name):
+        return self.connection.execute("SELECT 1 FROM sqlite_master WHERE name = ?", (name,)).fetchone() is not None
+
+    def _table_sql(self, name):
+        return self.connection.execute("SELECT sql FROM sqlite_master WHERE name = ?", (name,)).fetchone()[0]
+
+    def _has_column(self, table, name):
+        return any(row[1] == name for row in self.connection.execute(f"PRAGMA table_info({table})"))
+
+    @staticmethod
+    def _row_to_task(row):
+        task_id, description, completed, created_at, category, due_date, completed_at = row
+        return Task(
+            task_id,
+            description,
+            bool(completed),
+            datetime.datetime.fromisoformat(created_at),
+            category,
+            parse_due_date(due_date) if due_date else None,
+            datetime.datetime.fromisoformat(completed_at) if completed_at else None
+        )
+
+    @staticmethod
+    def _task_to_row(task):
+        return (
+            task.id,
+            task.description,
+            task.description.lower(),
+            int(task.completed),
+            task.created_at.isoformat(),
+            task.category,
+            task.due_date.strftime(DATE_FORMAT) if task.due_date else None,
+            task.completed_at.isoformat() if task.completed_at else None
+        )
+
+    # --- Changes (committed by save) ---
+    def insert(self, task):
+        self.connection.execute(
+            "INSERT INTO tasks (id, description, description_key, completed, created_at, category, due_date, "
+            "completed_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            self._task_to_row(task)
+        )
+
+    def insert_new(self, task):
+        """Inserts task unless a task with its id exists. Returns True if it was inserted."""
+        cursor = self.connection.execute(
+            "INSERT OR IGNORE INTO tasks (id, description, description_key, completed, created_at, category, "
+            "due_date, completed_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            self._task_to_row(task)
+        )
+        return cursor.rowcount == 1
+
+    def delete(self, task_id):
+        self.connection.execute("DELETE FROM tasks WHERE id = ?", (task_id,))
+
+    def set_completed(self, task_id, completed, completed_at=None):
+        self.connection.execute("UPDATE tasks SET completed = ?, completed_at = ? WHERE id = ?",
+                                (int(completed), completed_at.isoformat() if completed_at else None, task_id))
+
+    def save(self, records, snapshot=None, force_snapshot=False):
+        self.connection.commit()
+
+    def rollback(self):
+        self.connection.rollback()
+
+    def read_changes(self):
+        # Queries always see the latest rows; this only tells TaskManager its cached results are stale
+        data_version = self._read_data_version()
+        if data_version == self._data_version:
+            return None
+        self._data_version = data_version
+        return 'unknown', None
+
+    # --- Queries ---
+    def get(self, task_id):
+        row = self.connection.execute(f"SELECT {self.COLUMNS} FROM tasks WHERE id = ?", (task_id,)).fetchone()
+        return self._row_to_task(row) if row else None
+
+    def position(self, task_id):
+        """The task's insertion number, which breaks ties in every ORDER BY (0 if it isn't stored)."""
+        row = self.connection.execute("SELECT seq FROM tasks WHERE id = ?", (task_id,)).fetchone()
+        return row[0] if row else 0
+
+    def query(self, category=None, include_completed=True, sort_by='created_at'):
+        return self._select([], [], category, include_completed, self.ORDER_BY.get(sort_by, "seq"))
+
+    def iter_query(self, category=None, include_completed=True, sort_by='created_at', limit=None, after=None):
+        """
+        Yields tasks like query() one row at a time, ordered by sort_by and then id.
+        after is a (sort key, task id) cursor as made by task_manager.page_cursor();
+        only tasks that come after it are returned.
+        """
+        column = self.SORT_COLUMNS[sort_by]
+        conditions = []
+        params = []
+        if after is not None:
+            key, task_id = after
+            if sort_by == 'due_date':
+                # Tasks without a due date (key date.max) sort last
+                if key == datetime.date.max:
+                    conditions.append("due_date IS NULL AND id > ?")
+                    params.append(task_id)
+                else:
+                    key = key.strftime(DATE_FORMAT)
+                    conditions.append("(due_date IS NULL OR due_date > ? OR (due_date = ? AND id > ?))")
+                    params += [key, key, task_id]
+            else:
+                if sort_by == 'created_at':
+                    key = key.isoformat()
+                conditions.append(f"({column}, id) > (?, ?)")
+                params += [key, task_id]
+        order_by = "due_date IS NULL, due_date, id" if sort_by == 'due_date' else f"{column}, id"
+        for row in self._select(conditions, params, category, include_completed, order_by, limit, rows=True):
+            yield self._row_to_task(row)
+
+    def search(self, terms, category=None, include_completed=True, sort_by='created_at'):
+        """Like query(), limited to tasks with a word starting with each of terms (see search_index.tokenize)."""
+        # Terms are runs of letters and digits, so they need no quoting or escaping
+        if self.has_fts:
+            match = " ".join(f'"{term}"*' for term in terms) # Every term as a prefix query: "gro"* "mil"*
+            return self._select(["seq IN (SELECT rowid FROM tasks_fts WHERE tasks_fts MATCH ?)"], [match],
+                                category, include_completed, self.ORDER_BY.get(sort_by, "seq"))
+        # Without FTS5 terms match anywhere in the description, not just at the start of a word
+        conditions = ["description_key LIKE ?"] * len(terms)
+        return self._select(conditions, [f"%{term}%" for term in terms], category, include_completed,
+                            self.ORDER_BY.get(sort_by, "seq"))
+
+    def _select(self, conditions, params, category, include_completed, order_by, limit=None, rows=False):
+        """Runs a task query; returns a list of tasks, or the raw row cursor if rows is True."""
+        if category is not None:
+            conditions.append("category = ?")
+            params.append(category)
+        if not include_completed:
+            conditions.append("completed = 0")
+        sql = f"SELECT {self.COLUMNS} FROM tasks"
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        sql += " ORDER BY " + order_by
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        cursor = self.connection.execute(sql, params)
+        if rows:
+            return cursor
+        return [self._row_to_task(row) for row in cursor]
+
+    def categories(self):
+        return [row[0] for row in self.connection.execute("SELECT DISTINCT category FROM tasks ORDER BY category")]
+
+    def category_counts(self, include_completed=True):
+        sql = "SELECT category, COUNT(*) FROM tasks"
+        if not include_completed:
+            # Categories whose tasks are all completed still get a 0 count, like the in-memory store
+            sql = "SELECT category, SUM(completed = 0) FROM tasks"
+        return dict(self.connection.execute(sql + " GROUP BY category"))
+
+    def due_before(self, due_date, include_completed=True):
+        sql = f"SELECT {self.COLUMNS} FROM tasks WHERE due_date < ?"
+        if not include_completed:
+            sql += " AND completed = 0"
+        rows = self.connection.execute(sql + " ORDER BY due_date, id", (due_date.strftime(DATE_FORMAT),))
+        return [self._row_to_task(row) for row in rows]
+
+    def _due_range(self, start, end):
+        # Incomplete tasks with start <= due_date < end (no lower bound if start is None); uses the due_date index
+        sql = "FROM tasks WHERE completed = 0 AND due_date < ?"
+        params = [end.strftime(DATE_FORMAT)]
+        if start is not None:
+            sql += " AND due_date >= ?"
+            params.append(start.strftime(DATE_FORMAT))
+        return sql, params
+
+    def due_between(self, start, end):
+        sql, params = self._due_range(start, end)
+        return [self._row_to_task(row) for row in self.connection.execute(f"SELECT {self.COLUMNS} " + sql, params)]
+
+    def count_due_between(self, start, end):
+        sql, params = self._due_range(start, end)
+        return self.connection.execute("SELECT COUNT(*) " + sql, params).fetchone()[0]
+
+    def next_due_date(self, day):
+        """The earliest due date on or after day among incomplete tasks, or None."""
+        row = self.connection.execute("SELECT MIN(due_date) FROM tasks WHERE completed = 0 AND due_date >= ?",
+                                      (day.strftime(DATE_FORMAT),)).fetchone()
+        return parse_due_date(row[0]) if row[0] else None
+
+    def count(self):
+        return self.connection.execute("SELECT COUNT(*) FROM tasks").fetchone()[0]
+
+    def close(self):
+        self.connection.close()
@@ -10,6 +10,7 @@ class AppStyles:
     LIGHT_TEXT_COLOR = "#666666" # Lighter grey for meta info
     COMPLETED_TEXT_COLOR = "#888888" # Grey for completed task text
     OVERDUE_COLOR = "#d32f2f" # Darker red for overdue tasks
+    DUE_SOON_COLOR = "#e65100" # Orange for tasks due soon
     # ADD THIS LINE:
     BORDER_COLOR = "#e0e0e0" # Define a border color
 
@@ -0,0 +1,81 @@
+# task.py
+import datetime
+
+DATE_FORMAT = '%Y-%m-%d'
+
+def parse_due_date(value):
+    """Parses a 'YYYY-MM-DD' string into a date. Raises ValueError if it isn't one."""
+    # date.fromisoformat is far faster than strptime, which matters when loading many tasks
+    if len(value) == 10 and value[4] == '-' and value[7] == '-':
+        return datetime.date.fromisoformat(value)
+    return datetime.datetime.strptime(value, DATE_FORMAT).date()
+
+class Task:
+    """
+    A single task. Dates are parsed once when the task is created or loaded:
+    created_at is a datetime, due_date a date (or None) and completed_at the datetime the
+    task was last marked completed (None if it isn't, or was completed before this was recorded).
+    Use to_dict()/from_dict() to convert to and from the tasks.json schema.
+    """
+    __slots__ = ('id', 'description', 'completed', 'created_at', 'category', 'due_date', 'completed_at')
+
+    def __init__(self, id, description, completed=False, created_at=None, category='Uncategorized', due_date=None,
+                 completed_at=None):
+        self.id = id
+        self.description = description
+        self.completed = completed
+        self.created_at = created_at if created_at is not None else datetime.datetime.now()
+        self.category = category
+        self.due_date = due_date
+        self.completed_at = completed_at
+
+    @classmethod
+    def from_dict(cls, data):
+        due_date = None
+        if data.get('due_date'):
+            try:
+                due_date = parse_due_date(data['due_date'])
+            except ValueError:
+                print(f"Warning: Invalid due_date '{data['due_date']}' for task {data['id']}. Ignoring it.")
+        return cls(
+            data['id'],
+            data['description'],
+            bool(data.get('completed', False)),
+            datetime.datetime.fromisoformat(data['created_at']),
+            data.get('category') or 'Uncategorized',
+            due_date,
+            datetime.datetime.fromisoformat(data['completed_at']) if data.get('completed_at') else None
+        )
+
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "description": self.description,
+            "completed": self.completed,
+            "created_at": self.created_at.isoformat(),
+            "category": self.category,
+            "due_date": self.due_date.strftime(DATE_FORMAT) if self.due_date else None,
+            "completed_at": self.completed_at.isoformat() if self.completed_at else None
+        }
+
+    # Read-only dict-style access, returning the same values as the tasks.json schema,
+    # for code written against the old dict tasks (e.g. task['due_date'] is a string).
+    def __getitem__(self, key):
+        if key not in self.__slots__:
+            raise KeyError(key)
+        if key == 'created_at':
+            return self.created_at.isoformat()
+        if key == 'due_date':
+            return self.due_date.strftime(DATE_FORMAT) if self.due_date else None
+        if key == 'completed_at':
+            return self.completed_at.isoformat() if self.completed_at else None
+        return getattr(self, key)
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __repr__(self):
+        return f"Task({self.id!r}, {self.description!r}, completed={self.completed!r})"
@@ -0,0 +1,132 @@
+# task_io.py
+"""
+Reading and writing tasks as JSON Lines, CSV or a tasks.json-style JSON array, one task at
+a time, so files with millions of tasks are never held in memory as a whole.
+"""
+import csv
+import datetime
+import json
+import os
+import uuid
+from json_stream import iter_json_array
+from task import Task, parse_due_date
+
+FORMATS = ('jsonl', 'csv', 'json')
+CSV_FIELDS = ["id", "description", "completed", "created_at", "category", "due_date", "completed_at"]
+_EXTENSIONS = {'.jsonl': 'jsonl', '.ndjson': 'jsonl', '.csv': 'csv', '.json': 'json'}
+_TRUE = {'true', '1', 'yes', 'y'}
+_FALSE = {'false', '0', 'no', 'n', ''}
+
+class TaskImportError(ValueError):
+    """Raised when rows to import are invalid; nothing was imported."""
+    MAX_REPORTED = 20
+
+    def __init__(self, errors, count):
+        # errors holds the first MAX_REPORTED (row number, message) pairs, count is the total
+        self.errors = errors
+        self.count = count
+        lines = [f"row {number}: {message}" for number, message in errors]
+        if count > len(errors):
+            lines.append(f"... and {count - len(errors)} more")
+        super().__init__(f"{count} invalid row(s):\n" + "\n".join(lines))
+
+def format_for_path(path, default='jsonl'):
+    """Guesses the format from the file extension ('-' for stdin/stdout gives default)."""
+    return _EXTENSIONS.get(os.path.splitext(path)[1].lower(), default)
+
+def read_tasks(f, fmt):
+    """Yields one dict per task in f. Values are left as found; task_from_row() validates them."""
+    if fmt == 'jsonl':
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+    elif fmt == 'csv':
+        yield from csv.DictReader(f)
+    elif fmt == 'json':
+        yield from iter_json_array(f)
+    else:
+        raise ValueError(f"Unknown format '{fmt}'")
+
+def write_tasks(f, tasks, fmt):
+    """Writes tasks (any iterable of Task) to f. Returns the number written."""
+    written = 0
+    if fmt == 'jsonl':
+        for task in tasks:
+            f.write(json.dumps(task.to_dict()) + "\n")
+            written += 1
+    elif fmt == 'csv':
+        writer = csv.writer(f)
+        writer.writerow(CSV_FIELDS)
+        for task in tasks:
+            data = task.to_dict()
+            data['completed'] = 'true' if task.completed else 'false'
+            writer.writerow([data[field] or '' for field in CSV_FIELDS])
+            written += 1
+    elif fmt == 'json':
+        # The tasks.json layout, written one task at a time
+        f.write("[")
+        for task in tasks:
+            f.write(",\n" if written else "\n")
+            f.write(json.dumps(task.to_dict()))
+            written += 1
+        f.write("\n]\n")
+    else:
+        raise ValueError(f"Unknown format '{fmt}'")
+    return written
+
+def task_from_row(row):
+    """
+    Builds a Task from an imported row: description is required, id and created_at are
+    generated if missing, and timestamps with a UTC offset are converted to local time.
+    Raises ValueError with a short message if a value is invalid, e.g. a due_date that
+    isn't YYYY-MM-DD (rather than dropping it like Task.from_dict()).
+    """
+    if not isinstance(row, dict):
+        raise ValueError("not an object")
+    description = row.get('description')
+    if not isinstance(description, str) or not description.strip():
+        raise ValueError("missing description")
+
+    completed = row.get('completed', False)
+    if isinstance(completed, str):
+        value = completed.strip().lower()
+        if value not in _TRUE and value not in _FALSE:
+            raise ValueError(f"invalid completed value '{completed}'")
+        completed = value in _TRUE
+    elif completed is None:
+        completed = False
+    elif not isinstance(completed, (bool, int)):
+        raise ValueError(f"invalid completed value '{completed}'")
+
+    due_date = row.get('due_date') or None
+    if due_date is not None:
+        try:
+            due_date = parse_due_date(due_date)
+        except (ValueError, TypeError):
+            raise ValueError(f"invalid due_date '{due_date}', expected YYYY-MM-DD") from None
+
+    created_at = _parse_timestamp(row, 'created_at')
+    completed_at = _parse_timestamp(row, 'completed_at') if completed else None
+
+    return Task(
+        str(row.get('id') or uuid.uuid4()),
+        description.strip(),
+        bool(completed),
+        created_at,
+        str(row.get('category') or '').strip() or 'Uncategorized',
+        due_date,
+        completed_at
+    )
+
+def _parse_timestamp(row, field):
+    value = row.get(field) or None
+    if value is None:
+        return None
+    try:
+        moment = datetime.datetime.fromisoformat(value)
+    except (ValueError, TypeError):
+        raise ValueError(f"invalid {field} '{value}'") from None
+    if moment.tzinfo is not None:
+        # Tasks keep naive local times (datetime.now()); mixing in aware ones breaks every sort
+        moment = moment.astimezone().replace(tzinfo=None)
+    return moment
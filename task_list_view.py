@@ -0,0 +1,239 @@
+# task_list_view.py
+import tkinter as tk
+from tkinter import font as tkfont, ttk
+
+class VirtualTaskList(ttk.Frame):
+    """
+    A Listbox-like widget that only draws the rows currently on screen.
+
+    Rows come from a callback, row_provider(index) -> (text, fg, bg), which is only
+    called for the visible slice plus a small overscan buffer. The scrollbar still
+    spans every row, but refreshing and scrolling cost the same for 100 or 100,000 rows.
+    """
+    OVERSCAN = 10 # Rows formatted ahead above and below the visible slice
+    TEXT_PADDING_X = 6
+
+    def __init__(self, master, font, bg, fg, selectbackground, selectforeground, height=15, row_padding=4, **kwargs):
+        super().__init__(master, **kwargs)
+        self.font = tkfont.Font(font=font)
+        self.row_height = self.font.metrics('linespace') + row_padding
+        self.bg = bg
+        self.fg = fg
+        self.selectbackground = selectbackground
+        self.selectforeground = selectforeground
+
+        self.canvas = tk.Canvas(self, bg=bg, height=height * self.row_height, bd=0, highlightthickness=0, relief="flat", takefocus=1)
+        self.scrollbar = ttk.Scrollbar(self, orient="vertical", command=self.yview)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+
+        self._count = 0
+        self._row_provider = None
+        self._top = 0 # Index of the first visible row
+        self._row_cache = {} # {index: (text, fg, bg)} for the visible slice plus overscan
+        self._row_items = [] # Pooled (rectangle, text) canvas items, one per on-screen row slot
+        self._selection = set()
+        self._anchor = None # Start of a Shift-click range
+        self._render_pending = False
+
+        self.canvas.bind("<Configure>", lambda event: self._render())
+        self.canvas.bind("<Button-1>", self._on_click)
+        self.canvas.bind("<Control-Button-1>", self._on_ctrl_click)
+        self.canvas.bind("<Shift-Button-1>", self._on_shift_click)
+        self.canvas.bind("<MouseWheel>", self._on_mousewheel) # Windows/macOS
+        self.canvas.bind("<Button-4>", lambda event: self.yview('scroll', -3, 'units')) # Linux
+        self.canvas.bind("<Button-5>", lambda event: self.yview('scroll', 3, 'units'))
+        self.canvas.bind("<Up>", lambda event: self._move_selection(-1))
+        self.canvas.bind("<Down>", lambda event: self._move_selection(1))
+
+    # --- Data ---
+    def set_rows(self, count, row_provider):
+        """Replaces the list contents with count rows drawn by row_provider. Clears the selection."""
+        self._count = count
+        self._row_provider = row_provider
+        self._row_cache = {}
+        self._selection = set()
+        self._anchor = None
+        self._top = self._clamp_top(self._top)
+        self._render()
+
+    def refresh(self):
+        """Redraws the visible rows, e.g. after the data behind them changed."""
+        self._row_cache = {}
+        self._render()
+
+    # Incremental updates: the caller has already changed its data, these keep rows and selection in step
+    def insert_row(self, index):
+        """A row was inserted at index; rows after it move down by one."""
+        self._count += 1
+        self._shift_rows(index, 1)
+
+    def delete_row(self, index):
+        """The row at index was removed; rows after it move up by one."""
+        self._count -= 1
+        self._selection.discard(index)
+        self._shift_rows(index + 1, -1)
+
+    def update_row(self, index):
+        """The row at index changed in place; only that row is re-formatted and redrawn."""
+        self._row_cache.pop(index, None)
+        slot = index - self._top
+        if 0 <= slot < len(self._row_items) and index in self._visible_range():
+            self._row_cache[index] = self._row_provider(index)
+            self._draw_slot(slot, index, self.canvas.winfo_width())
+
+    def _shift_rows(self, start, offset):
+        self._selection = {i + offset if i >= start else i for i in self._selection}
+        if self._anchor is not None and self._anchor >= start:
+            self._anchor += offset
+        # Cached rows from start onwards no longer match their index
+        self._row_cache = {i: row for i, row in self._row_cache.items() if i < start}
+        self._top = self._clamp_top(self._top)
+        if not self._render_pending:
+            self._render_pending = True
+            self.after_idle(self._render) # Several changes in a row only redraw once
+
+    def size(self):
+        return self._count
+
+    # --- Selection (mirrors tk.Listbox) ---
+    def curselection(self):
+        return tuple(sorted(self._selection))
+
+    def selection_clear(self):
+        self._selection = set()
+        self._render()
+
+    def selection_set(self, index):
+        if 0 <= index < self._count:
+            self._selection.add(index)
+            self._render()
+
+    def see(self, index):
+        """Scrolls so that the row at index is visible."""
+        visible = self._visible_rows()
+        if index < self._top:
+            self._top = index
+        elif index >= self._top + visible:
+            self._top = index - visible + 1
+        self._top = self._clamp_top(self._top)
+        self._render()
+
+    # --- Scrolling ---
+    def yview(self, *args):
+        """Scrollbar command; accepts the same 'moveto'/'scroll' arguments as Listbox.yview."""
+        if not args:
+            return self._scroll_fractions()
+        if args[0] == 'moveto':
+            top = int(float(args[1]) * self._count)
+        elif args[0] == 'scroll':
+            step = int(args[1])
+            if args[2] == 'pages':
+                step *= max(1, self._visible_rows() - 1)
+            top = self._top + step
+        else:
+            return None
+        self._top = self._clamp_top(top)
+        self._render()
+        return None
+
+    def _visible_rows(self):
+        """Number of rows that fit completely in the canvas."""
+        return max(1, self.canvas.winfo_height() // self.row_height)
+
+    def _clamp_top(self, top):
+        return max(0, min(top, self._count - self._visible_rows()))
+
+    def _scroll_fractions(self):
+        if not self._count:
+            return 0.0, 1.0
+        first = self._top / self._count
+        last = min(1.0, (self._top + self.canvas.winfo_height() / self.row_height) / self._count)
+        return first, last
+
+    # --- Drawing ---
+    def _slot_count(self):
+        return self.canvas.winfo_height() // self.row_height + 1 # +1 for a partially visible last row
+
+    def _visible_range(self):
+        return range(self._top, min(self._count, self._top + self._slot_count()))
+
+    def _render(self):
+        self._render_pending = False
+        width = self.canvas.winfo_width()
+        slots = self._slot_count()
+
+        while len(self._row_items) < slots:
+            rectangle = self.canvas.create_rectangle(0, 0, 0, 0, width=0)
+            text = self.canvas.create_text(0, 0, anchor="w", font=self.font)
+            self._row_items.append((rectangle, text))
+
+        # Keep only the visible slice plus overscan formatted; everything else is never touched
+        first = max(0, self._top - self.OVERSCAN)
+        last = min(self._count, self._top + slots + self.OVERSCAN)
+        cache = {}
+        for index in range(first, last):
+            row = self._row_cache.get(index)
+            cache[index] = row if row is not None else self._row_provider(index)
+        self._row_cache = cache
+
+        for slot, (rectangle, text) in enumerate(self._row_items):
+            index = self._top + slot
+            if slot >= slots or index >= self._count:
+                self.canvas.itemconfigure(rectangle, state="hidden")
+                self.canvas.itemconfigure(text, state="hidden")
+                continue
+            self._draw_slot(slot, index, width)
+
+        self.scrollbar.set(*self._scroll_fractions())
+
+    def _draw_slot(self, slot, index, width):
+        rectangle, text = self._row_items[slot]
+        row_text, fg, bg = self._row_cache[index]
+        if index in self._selection:
+            fg, bg = self.selectforeground, self.selectbackground
+        y = slot * self.row_height
+        self.canvas.coords(rectangle, 0, y, width, y + self.row_height)
+        self.canvas.itemconfigure(rectangle, fill=bg, state="normal")
+        self.canvas.coords(text, self.TEXT_PADDING_X, y + self.row_height // 2)
+        self.canvas.itemconfigure(text, text=row_text, fill=fg, state="normal")
+
+    # --- Events ---
+    def _index_at(self, y):
+        index = self._top + y // self.row_height
+        return index if index < self._count else None
+
+    def _on_click(self, event):
+        self.canvas.focus_set()
+        index = self._index_at(event.y)
+        self._selection = {index} if index is not None else set()
+        self._anchor = index
+        self._render()
+
+    def _on_ctrl_click(self, event):
+        index = self._index_at(event.y)
+        if index is not None:
+            self._selection ^= {index}
+            self._anchor = index
+            self._render()
+        return "break"
+
+    def _on_shift_click(self, event):
+        index = self._index_at(event.y)
+        if index is not None:
+            anchor = self._anchor if self._anchor is not None else index
+            self._selection = set(range(min(anchor, index), max(anchor, index) + 1))
+            self._render()
+        return "break"
+
+    def _on_mousewheel(self, event):
+        self.yview('scroll', -3 if event.delta > 0 else 3, 'units')
+
+    def _move_selection(self, step):
+        if not self._count:
+            return
+        current = self._anchor if self._anchor is not None else -step
+        index = max(0, min(self._count - 1, current + step))
+        self._selection = {index}
+        self._anchor = index
+        self.see(index)
@@ -1,123 +1,1236 @@
-import json
+import bisect
+import contextlib
 import datetime
+import functools
+import heapq
+import itertools
+import threading
 import uuid # For generating unique IDs
+from operator import attrgetter
+from background_writer import BackgroundWriter
+from columnar import ColumnStore
+from metrics import metrics
+from query_cache import QueryCache
+from search_index import SearchIndex, matches, tokenize
+from storage import DEFAULT_COMPACT_THRESHOLD, JSONFileStorage
+from task import Task, parse_due_date
+from task_io import TaskImportError, task_from_row
+
+# With write_behind=True, changes made within this many seconds are saved together
+DEFAULT_WRITE_DELAY = 0.5
+# Number of recent get_tasks()/get_categories()/search() results kept for repeated queries
+DEFAULT_CACHE_SIZE = 32
+# Incomplete tasks due within this many days (today included) are due soon
+DEFAULT_DUE_SOON_DAYS = 1
+# The app archives tasks completed this many days ago (a TaskManager only archives if given archive_after)
+DEFAULT_ARCHIVE_AFTER_DAYS = 30
+# iter_tasks() reads a query backend this many rows at a time, each chunk under the lock
+QUERY_CHUNK_SIZE = 1000
+
+# Sort keys for get_tasks(sort_by=...). Dates are already parsed, so keys are plain attribute reads.
+SORT_KEYS = {
+    'created_at': attrgetter('created_at'), # Oldest first
+    'due_date': lambda t: t.due_date or datetime.date.max, # Earliest first, None due dates go to the end
+    'description': lambda t: t.description.lower(),
+    'completed': attrgetter('completed'), # Completed tasks at the end
+}
+
+def _locked(method):
+    """Runs a TaskManager method while holding its lock, so other threads never see a change half made."""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._lock:
+            return method(self, *args, **kwargs)
+    return wrapper
+
+def _parse_timestamp(value):
+    return datetime.datetime.fromisoformat(value) if value else None
+
+def page_cursor(task, sort_by='created_at'):
+    """
+    Returns the cursor to pass as TaskManager.iter_tasks(after=...) to continue right after task.
+    Take it when the page is read: it records the task's sort key at that moment.
+    """
+    return (SORT_KEYS[sort_by](task), task.id)
 
 class TaskManager:
-    def __init__(self, filename="tasks.json"):
-        self.filename = filename
-        self.tasks = self._load_tasks()
+    def __init__(self, filename="tasks.json", journal=False, compact_threshold=DEFAULT_COMPACT_THRESHOLD,
+                 write_behind=False, write_delay=DEFAULT_WRITE_DELAY, lazy=False, storage=None,
+                 cache_size=DEFAULT_CACHE_SIZE, due_soon_days=DEFAULT_DUE_SOON_DAYS, archive_after=None,
+                 columnar=False):
+        """
+        storage is the backend tasks are kept in (see storage.py). By default they are kept
+        in a JSON file, JSONFileStorage(filename, journal, compact_threshold):
+        with journal=True every mutation is appended as one record to '<filename>.journal'
+        instead of rewriting the whole file.
 
-    def _load_tasks(self):
-        try:
-            with open(self.filename, 'r') as f:
-                loaded_tasks = json.load(f)
-                # Ensure all loaded tasks have a 'created_at' and 'id' for backward compatibility
-                for task in loaded_tasks:
-                    if 'id' not in task:
-                        task['id'] = str(uuid.uuid4())
-                    if 'created_at' not in task:
-                        task['created_at'] = datetime.datetime.now().isoformat()
-                    if 'category' not in task: # Add default category
-                        task['category'] = 'Uncategorized'
-                    if 'due_date' not in task: # Add default due_date
-                        task['due_date'] = None
-                return loaded_tasks
-        except FileNotFoundError:
-            return []
-        except json.JSONDecodeError:
-            print("Warning: tasks.json is corrupted or empty. Starting with an empty list.")
-            return []
+        With write_behind=True saving happens on a background thread: changes made within
+        write_delay seconds are written together and mutations never wait on the disk.
+        Call close() (or flush()) before exiting to make sure everything is on disk.
+
+        With lazy=True no tasks are read up front. The file is parsed as a stream and tasks
+        are added by load_more(), so the caller can show the first ones right away.
+
+        A query backend such as SQLiteStorage answers get_tasks() and the other queries
+        itself and is never loaded into memory; lazy and write_behind don't apply to it.
+
+        The last cache_size query results are cached until the next change (0 disables this),
+        see cache_stats().
+
+        All public methods may be called from any thread: each runs under one re-entrant lock,
+        and a batch() keeps other threads out until it is saved. The storage's file lock is
+        always taken after it, never before.
+
+        Incomplete tasks are overdue once their due date has passed and due soon within
+        due_soon_days of it, see due_state() and advance_due_dates().
+
+        With archive_after set, tasks completed more than archive_after days ago are moved to
+        the storage's archive once loading finishes (see archive_completed()), so loading and
+        saving only deal with the rest. Archived tasks are read back the first time a query
+        includes completed tasks, and marking one as not completed moves it back. With
+        write_behind both happen on the background writer instead: queries leave archived
+        tasks out until it has read them, then listeners get a 'loaded' event.
+
+        With columnar=True the loaded tasks are also kept as columns (see columnar.py), and
+        get_tasks() filters and sorts those with array operations instead of task by task.
+        This costs a few dozen bytes per task and pays off on large lists once NumPy is installed.
+        """
+        if storage is None:
+            storage = JSONFileStorage(filename, journal, compact_threshold)
+        self.storage = storage
+        self._resident = storage.resident # Tasks live in self.tasks rather than in the backend
+        self._needs_snapshot = False # The background writer should write a full snapshot next time
+        self._batch_records = None # Mutations waiting for the end of the current batch()
+        self._undo = None # Inverse actions used to roll back a failed batch()
+        self._listeners = [] # Callbacks notified of every change, see add_listener()
+        self._lock = threading.RLock() # Guards all state against other threads, see _locked()
+        self._pending_records = [] # Records waiting for the background writer
+        self._writer = None
+        self._loader = None # Yields stored tasks not read yet; None once everything is loaded
+        self.tasks = {} # {task_id: task}, kept in insertion order (empty for query backends)
+
+        # Secondary indexes, kept up to date by every mutation
+        self._category_index = {} # {category: {task_id: task}}
+        self._categories = [] # Sorted category names
+        self._open_counts = {} # {category: number of incomplete tasks}
+        self._due_index = [] # Sorted (due_date, task_id) pairs for tasks with a due date
+        # {task_id: number} of loaded and archived tasks, increasing in the order they were added, see position()
+        self._positions = {}
+        self._next_position = itertools.count()
+        self._columns = ColumnStore() if columnar and self._resident else None # Loaded tasks only, for get_tasks()
+        self._search_index = None # Words of task descriptions for search(), built on first use
+        self._search_backlog = [] # Ids of tasks loaded before the search index was started
+        self._query_cache = QueryCache(cache_size) # Invalidated by every change
+        # The day due states refer to, moved on by advance_due_dates()
+        self.due_soon_days = due_soon_days
+        self.today = datetime.date.today()
+        self._soon_end = self.today + datetime.timedelta(days=due_soon_days) # Due before this is due soon
+        self._due_counts = {'overdue': 0, 'due_soon': 0} # Incomplete tasks in each due state
+        self.archive_after = archive_after
+        self._archive = None # {task_id: task} of archived tasks, read on first use by _archived_tasks()
+        self._archive_removals = set() # Ids to drop from the archive file with the next save
+        self._archive_generation = 0 # Changes whenever self._archive is set or dropped
+        self._needs_archiving = False # The background writer should run archive_completed() next time
+        self._reading_archive = False # The background writer reads the archive; queries wait for it
+
+        if self._resident:
+            self._loader = storage.iter_tasks(streaming=lazy)
+            if not lazy:
+                self.finish_loading()
+            if write_behind:
+                self._writer = BackgroundWriter(self._write_behind, write_delay)
+
+    @property
+    def loading(self):
+        """True while a lazy TaskManager still has tasks on disk that load_more() hasn't read yet."""
+        return self._loader is not None
+
+    def load_more(self, count=None):
+        """
+        Loads up to count more tasks from disk (all remaining ones if count is None)
+        and notifies listeners with a 'loaded' event. Returns True if tasks remain.
+        """
+        if self._loader is None:
+            return False
+        loaded = 0
+        due_pairs = [] # Sorted into the due-date index once per slice instead of one insort per task
+        mark = metrics.timer('load_tasks')
+        with self._lock:
+            for task_data in self._loader:
+                # Parse every record into a Task once, so dates are never re-parsed afterwards
+                task = Task.from_dict(task_data)
+                self.tasks[task.id] = task
+                self._index_task(task, due_pairs)
+                loaded += 1
+                if count is not None and loaded >= count:
+                    break
+            else:
+                self._loader = None
+            if due_pairs:
+                self._due_index.extend(due_pairs)
+                self._due_index.sort()
+            if loaded or self._loader is None: # Once loaded, queries include archived tasks too
+                self._query_cache.invalidate()
+        if loaded:
+            mark()
+            metrics.observe('load_tasks.count', loaded)
+        if self._loader is None:
+            self._finish_migration()
+            if self._writer is not None:
+                # Archiving and reading the archive take a while, and the caller may be the UI thread
+                with self._lock:
+                    self._needs_archiving = True
+                    self._reading_archive = self.storage.archive is not None
+                self._writer.request()
+            else:
+                self.archive_completed()
+        if loaded:
+            self._emit('loaded', None)
+        return self._loader is not None
+
+    def finish_loading(self):
+        """Loads every task that hasn't been loaded yet."""
+        self.load_more(None)
+
+    def _finish_migration(self):
+        # Write backfilled fields (and stable ids) back once, so later starts skip the migration
+        if self.storage.wants_snapshot():
+            self._request_snapshot()
+
+    def _request_snapshot(self):
+        if self._writer is not None:
+            self._needs_snapshot = True
+            self._writer.request()
+        else:
+            self._save_tasks()
 
     def _save_tasks(self):
-        with open(self.filename, 'w') as f:
-            json.dump(self.tasks, f, indent=4)
+        with self._lock: # Taken before the storage lock, which the snapshot is read under
+            self._save([], self._snapshot, force_snapshot=True)
+
+    def _save(self, records, snapshot, force_snapshot=False, archive_removals=None):
+        mark = metrics.timer('save_tasks')
+        with self.storage.locked():
+            written = self.storage.save(records, snapshot, force_snapshot)
+            if archive_removals:
+                # Only now that the records moving these tasks out of the archive are saved
+                self.storage.archive.remove(archive_removals)
+        mark()
+        if written is not None:
+            metrics.observe('save_tasks.bytes', written)
+
+    def _snapshot(self):
+        with self._lock:
+            return [task.to_dict() for task in self.tasks.values()]
+
+    def _snapshot_source(self):
+        # A full snapshot can only be written once every task is loaded
+        return self._snapshot if self._loader is None else None
+
+    def _index_task(self, task, due_pairs=None):
+        self._positions[task.id] = next(self._next_position)
+        category = task.category
+        bucket = self._category_index.get(category)
+        if bucket is None:
+            bucket = self._category_index[category] = {}
+            bisect.insort(self._categories, category)
+            self._open_counts[category] = 0
+        bucket[task.id] = task
+        if not task.completed:
+            self._open_counts[category] += 1
+        if self._search_index is not None:
+            self._search_index.add(task.id, task.description)
+        if task.due_date:
+            if due_pairs is not None:
+                due_pairs.append((task.due_date, task.id)) # Caller sorts them in
+            else:
+                bisect.insort(self._due_index, (task.due_date, task.id))
+            if not task.completed:
+                self._count_due_state(task.due_date, 1)
+        if self._columns is not None:
+            self._columns.add(task)
+
+    def _unindex_task(self, task, due_removed=None):
+        del self._positions[task.id]
+        category = task.category
+        bucket = self._category_index[category]
+        del bucket[task.id]
+        if not task.completed:
+            self._open_counts[category] -= 1
+        if not bucket: # Last task of this category is gone
+            del self._category_index[category]
+            del self._open_counts[category]
+            self._categories.pop(bisect.bisect_left(self._categories, category))
+        if task.due_date:
+            if due_removed is not None:
+                due_removed.add(task.id) # Caller filters them out
+            else:
+                del self._due_index[bisect.bisect_left(self._due_index, (task.due_date, task.id))]
+            if not task.completed:
+                self._count_due_state(task.due_date, -1)
+        if self._search_index is not None:
+            self._search_index.remove(task.id, task.description)
+        if self._columns is not None:
+            self._columns.remove(task.id)
+
+    def add_listener(self, callback):
+        """
+        Registers callback(event_type, task), called after every change to a task, on the
+        thread that made the change and with the lock held (so it must not wait for other threads).
+        event_type is 'added', 'removed' or 'updated' (completion status changed).
+        Listeners can use SORT_KEYS to find where the task sits in their own sorted view.
+        advance_due_dates() sends 'overdue' or 'due_soon' when a task reaches that due state
+        (or 'not_due' if the clock was set back).
+        A lazy TaskManager also sends ('loaded', None) after each load_more() slice (and from the
+        background writer once it has read the archive, see archive_after), and
+        ('reloaded', None) means tasks changed in ways that can't be told task by task
+        (a bulk import_tasks(), or another process wrote to a query backend, see
+        merge_external_changes()).
+        """
+        self._listeners.append(callback)
+
+    def remove_listener(self, callback):
+        self._listeners.remove(callback)
+
+    def _emit(self, event_type, task):
+        for callback in self._listeners:
+            callback(event_type, task)
+
+    # All mutations go through these three helpers so indexes, batch rollback and listeners stay in sync.
+    # With a query backend they issue the single-row statement instead of touching the indexes.
+    def _insert(self, task, archived=False):
+        with self._lock:
+            if archived: # Undoing the deletion of an archived task
+                self._archive[task.id] = task
+                self._positions[task.id] = next(self._next_position)
+                self._archive_removals.discard(task.id)
+            elif self._resident:
+                self.tasks[task.id] = task
+                self._index_task(task)
+            else:
+                self.storage.insert(task)
+            self._query_cache.invalidate()
+        if self._undo is not None:
+            self._undo.append(lambda: self._remove(task))
+        self._emit('added', task)
 
+    def _remove(self, task):
+        archived = self._resident and task.id not in self.tasks
+        with self._lock:
+            if archived:
+                del self._archive[task.id]
+                del self._positions[task.id]
+                self._archive_removals.add(task.id)
+            elif self._resident:
+                del self.tasks[task.id]
+                self._unindex_task(task)
+            else:
+                self.storage.delete(task.id)
+            self._query_cache.invalidate()
+        if self._undo is not None:
+            self._undo.append(lambda: self._insert(task, archived))
+        self._emit('removed', task)
+
+    # Moving tasks between self.tasks and the archived ones is invisible to listeners: either way
+    # the task is still there. Only the caller writes the archive file (or records the move).
+    def _promote(self, task):
+        with self._lock:
+            if self._archive is not None and self._archive.pop(task.id, None) is not None:
+                del self._positions[task.id]
+            self._archive_removals.add(task.id)
+            self.tasks[task.id] = task
+            self._index_task(task)
+            self._query_cache.invalidate()
+        if self._undo is not None:
+            self._undo.append(lambda: self._demote(task))
+
+    def _demote(self, task, due_removed=None):
+        with self._lock:
+            del self.tasks[task.id]
+            self._unindex_task(task, due_removed)
+            self._archive_removals.discard(task.id)
+            if self._archive is not None:
+                self._archive[task.id] = task
+                self._positions[task.id] = next(self._next_position)
+            self._query_cache.invalidate()
+        if self._undo is not None:
+            self._undo.append(lambda: self._promote(task))
+
+    def _set_completed(self, task, completed, completed_at=None):
+        if task.completed == completed:
+            return False
+        previous_completed_at = task.completed_at
+        with self._lock:
+            task.completed = completed
+            task.completed_at = (completed_at or datetime.datetime.now()) if completed else None
+            if self._resident:
+                self._open_counts[task.category] += -1 if completed else 1
+                if task.due_date:
+                    self._count_due_state(task.due_date, -1 if completed else 1)
+                if self._columns is not None:
+                    self._columns.set_completed(task.id, completed)
+            else:
+                self.storage.set_completed(task.id, completed, task.completed_at)
+            self._query_cache.invalidate()
+        if self._undo is not None:
+            self._undo.append(lambda: self._set_completed(task, not completed, previous_completed_at))
+        self._emit('updated', task)
+        return True
+
+    def _change_completed(self, task, completed):
+        """Sets task's completion status and records the change. Returns False if it already had it."""
+        if self._resident and task.id not in self.tasks:
+            if completed:
+                return False # Archived tasks are all completed
+            self._promote(task)
+            self._set_completed(task, False)
+            self._record({"op": "add", "task": task.to_dict()}) # The stored tasks don't have it
+            return True
+        if not self._set_completed(task, completed):
+            return False
+        self._record({"op": "set", "id": task.id, "completed": completed, "completed_at": task['completed_at']})
+        return True
+
+    def _record(self, record):
+        """Persists a single mutation, or queues it if a batch() is in progress."""
+        if self._batch_records is not None:
+            self._batch_records.append(record)
+        else:
+            self._persist([record])
+
+    def _persist(self, records):
+        """Hands mutations to the storage backend, either now or via the background writer."""
+        # A batch is saved as a single record, so a torn write drops all of it or none of it
+        record = records[0] if len(records) == 1 else {"op": "batch", "ops": records}
+        if self._loader is not None and self.storage.needs_full_snapshot:
+            self.finish_loading()
+        if self._writer is not None:
+            with self._lock:
+                self._pending_records.append(record)
+            self._writer.request()
+            return
+        with self._lock:
+            archive_removals = self._take_archive_removals()
+        self._save([record], self._snapshot_source(), archive_removals=archive_removals)
+
+    def _take_archive_removals(self):
+        archive_removals = self._archive_removals
+        self._archive_removals = set()
+        return archive_removals
+
+    def _write_behind(self):
+        """
+        The background writer's callback: archives old tasks if loading just finished, saves
+        pending changes (and the snapshot archiving needs), then reads the archive if queries wait for it.
+        """
+        with self._lock:
+            archiving = self._needs_archiving
+            self._needs_archiving = False
+        if archiving:
+            try:
+                moved = self._move_to_archive()
+            except Exception:
+                with self._lock:
+                    self._needs_archiving = True # Retried with the next round
+                raise
+            if moved:
+                with self._lock:
+                    self._needs_snapshot = True
+        self._flush_pending_writes()
+        if self._reading_archive:
+            self._read_archive_in_background()
+
+    def _flush_pending_writes(self):
+        """Runs on the background writer thread; the lock is only held while copying state."""
+        with self._lock:
+            records = self._pending_records
+            self._pending_records = []
+            force_snapshot = self._needs_snapshot
+            self._needs_snapshot = False
+            archive_removals = self._take_archive_removals()
+            # A snapshot the storage may want is copied now: its lock must not be held while waiting for ours
+            snapshot = None
+            if self._loader is None and (force_snapshot or self.storage.needs_full_snapshot
+                                         or self.storage.wants_snapshot()):
+                tasks = self._snapshot()
+                snapshot = lambda: tasks
+        try:
+            self._save(records, snapshot, force_snapshot=force_snapshot, archive_removals=archive_removals)
+        except Exception:
+            with self._lock:
+                self._pending_records[:0] = records # Keep them for the retry
+                self._needs_snapshot = self._needs_snapshot or force_snapshot
+                self._archive_removals |= archive_removals
+            raise
+
+    def merge_external_changes(self):
+        """
+        Applies what other processes (another app instance, a script) saved to the same storage
+        since this TaskManager last read or wrote it, task by task, and notifies listeners like
+        any other change. Returns True if anything changed.
+
+        Only stats the files when nothing changed, so it's cheap enough to poll. It waits (returns
+        False) while tasks are loading or local changes haven't been written yet, so those stay in order.
+        """
+        with self._lock:
+            if self._loader is not None or self._batch_records is not None or self.has_pending_writes():
+                return False
+            return self._merge_external_changes()
+
+    def _merge_external_changes(self):
+        archive_changed = self._drop_stale_archive()
+        changes = self.storage.read_changes()
+        if changes is None:
+            return archive_changed
+        kind, data = changes
+        if kind == 'records':
+            changed = 0
+            for record in data:
+                changed += self._apply_record(record)
+            return changed > 0 or archive_changed
+        if kind == 'tasks':
+            return self._merge_stored_tasks(data) or archive_changed
+        self._query_cache.invalidate()
+        self._emit('reloaded', None)
+        return True
+
+    def _drop_stale_archive(self):
+        """Forgets the archived tasks read so far if another process wrote the archive since. Returns True if it did."""
+        if self._archive is None or not self.storage.archive.changed():
+            return False
+        for task_id in self._archive:
+            del self._positions[task_id]
+        self._archive = None # Read again by the next query that needs it, or by the background writer
+        self._archive_generation += 1
+        if self._writer is not None:
+            self._reading_archive = True
+            self._writer.request()
+        self._query_cache.invalidate()
+        self._emit('reloaded', None)
+        return True
+
+    def _apply_record(self, record):
+        """Applies one change record saved by another process. Returns the number of tasks changed."""
+        op = record.get('op')
+        if op == 'add':
+            return self._merge_task(record['task'])
+        if op == 'delete':
+            task = self.tasks.get(record['id'])
+            if task is None:
+                return 0
+            self._remove(task)
+            return 1
+        if op == 'set':
+            task = self.tasks.get(record['id'])
+            return int(task is not None and self._set_completed(task, record['completed'],
+                                                                 _parse_timestamp(record.get('completed_at'))))
+        if op == 'batch':
+            return sum(self._apply_record(sub_record) for sub_record in record['ops'])
+        return 0
+
+    def _merge_task(self, task_data):
+        """Makes the task with task_data's id look like task_data. Returns 1 if it changed, else 0."""
+        task = self.tasks.get(task_data['id'])
+        if task is not None:
+            current = task.to_dict()
+            if current == task_data:
+                return 0 # Usually a record this process wrote itself
+            current['completed'] = task_data.get('completed', False)
+            current['completed_at'] = task_data.get('completed_at')
+            if current == task_data:
+                self._set_completed(task, current['completed'], _parse_timestamp(current['completed_at']))
+                return 1
+            self._remove(task) # Edited some other way: replace it
+        elif self._archive is not None and task_data['id'] in self._archive:
+            self._remove(self._archive[task_data['id']]) # Moved out of the archive by another process
+        self._insert(Task.from_dict(task_data))
+        return 1
+
+    def _merge_stored_tasks(self, stored_tasks):
+        """Brings memory in line with the full list of stored tasks, changing only the tasks that differ."""
+        changed = 0
+        stored_ids = set()
+        for task_data in stored_tasks:
+            stored_ids.add(task_data['id'])
+            changed += self._merge_task(task_data)
+        for task in [task for task_id, task in self.tasks.items() if task_id not in stored_ids]:
+            self._remove(task)
+            changed += 1
+        return changed > 0
+
+    def has_pending_writes(self):
+        """True while changes are waiting for (or being written by) the background writer."""
+        return self._writer is not None and self._writer.pending()
+
+    def flush(self, timeout=None):
+        """Blocks until every change so far is on disk. Returns False on timeout."""
+        if self._writer is None:
+            return True
+        return self._writer.flush(timeout)
+
+    def close(self):
+        """Writes any pending changes and releases files. Safe to call more than once."""
+        if self._writer is not None:
+            self._writer.close()
+        self.storage.close()
+
+    @contextlib.contextmanager
+    def batch(self):
+        """
+        Groups mutations so they are persisted with a single write when the block exits:
+
+            with task_manager.batch():
+                task_manager.add_task(...)
+                task_manager.toggle_task_status(...)
+
+        If the block raises, every change made inside it is rolled back and nothing is written.
+        Nested batches join the outermost one.
+        """
+        # Holding the lock keeps the background writer from saving a half-finished batch
+        with self._lock:
+            if self._batch_records is not None:
+                yield self
+                return
+            self._batch_records = []
+            self._undo = []
+            try:
+                yield self
+            except BaseException:
+                undo = self._undo
+                self._batch_records = None
+                self._undo = None
+                for action in reversed(undo):
+                    action()
+                self.storage.rollback()
+                raise
+            records = self._batch_records
+            self._batch_records = None
+            self._undo = None
+            if records:
+                self._persist(records)
+
+    @_locked
     def add_task(self, description, category='Uncategorized', due_date=None):
         """
         Adds a new task with a unique ID, creation timestamp, category, and optional due date.
         due_date should be in 'YYYY-MM-DD' format if provided.
+        Returns the new task's ID, or False if the description is empty.
         """
         if description.strip():
             task_id = str(uuid.uuid4()) # Generate a unique ID for the task
-            created_at = datetime.datetime.now().isoformat() # ISO format for easy storage and parsing
 
             # Validate due_date format if provided
             validated_due_date = None
             if due_date:
                 try:
-                    # Attempt to parse to ensure it's a valid date
-                    datetime.datetime.strptime(due_date, '%Y-%m-%d')
-                    validated_due_date = due_date # Keep it as string for storage
+                    validated_due_date = parse_due_date(due_date) # Parsed once, kept as a date
                 except ValueError:
                     print(f"Warning: Invalid due_date format '{due_date}'. Expected YYYY-MM-DD. Setting due_date to None.")
 
-            self.tasks.append({
-                "id": task_id,
-                "description": description.strip(),
-                "completed": False,
-                "created_at": created_at,
-                "category": category.strip() if category else 'Uncategorized',
-                "due_date": validated_due_date
-            })
-            self._save_tasks()
-            return True
+            task = Task(
+                task_id,
+                description.strip(),
+                category=category.strip() if category else 'Uncategorized',
+                due_date=validated_due_date
+            )
+            self._insert(task)
+            self._record({"op": "add", "task": task.to_dict()})
+            return task_id
         return False
 
+    @_locked
     def delete_task(self, task_id):
         """Deletes a task by its unique ID."""
-        initial_len = len(self.tasks)
-        self.tasks = [task for task in self.tasks if task['id'] != task_id]
-        if len(self.tasks) < initial_len:
-            self._save_tasks()
-            return True
-        return False
+        task = self.get_task(task_id)
+        if task is None:
+            return False
+        self._remove(task)
+        self._record({"op": "delete", "id": task_id})
+        return True
 
+    @_locked
     def toggle_task_status(self, task_id):
-        """Toggles the completion status of a task by its unique ID."""
-        for task in self.tasks:
-            if task['id'] == task_id:
-                task["completed"] = not task["completed"]
-                self._save_tasks()
-                return True
-        return False
+        """Toggles the completion status of a task by its unique ID. An archived task moves back out of the archive."""
+        task = self.get_task(task_id)
+        if task is None:
+            return False
+        self._change_completed(task, not task.completed)
+        return True
+
+    def add_tasks(self, tasks):
+        """
+        Adds several tasks with a single write. Each item is a dict of add_task() arguments,
+        e.g. {"description": "...", "category": "Work", "due_date": "2025-08-01"}.
+        Returns the number of tasks added.
+        """
+        with self.batch():
+            return sum(1 for task in tasks if self.add_task(**task))
+
+    def delete_tasks(self, task_ids):
+        """Deletes several tasks by ID with a single write. Returns the number deleted."""
+        with self.batch():
+            return sum(1 for task_id in task_ids if self.delete_task(task_id))
+
+    @_locked
+    def set_completed(self, task_ids, completed):
+        """Marks several tasks as completed (or not) with a single write. Returns the number changed."""
+        changed = 0
+        with self.batch():
+            for task_id in task_ids:
+                task = self.get_task(task_id)
+                if task is not None and self._change_completed(task, completed):
+                    changed += 1
+        return changed
+
+    def import_tasks(self, rows, skip_invalid=False, on_skip=None):
+        """
+        Adds many tasks at once, e.g. read with task_io.read_tasks(). Each row is a dict in the
+        tasks.json schema; see task_io.task_from_row() for what's accepted.
+
+        Every row is validated before anything is written. If any is invalid TaskImportError
+        is raised and nothing is imported, unless skip_invalid is True, in which case those rows
+        are left out. Rows whose id already exists are always left out. on_skip(row_number, reason)
+        is called for every row left out. Returns the number of tasks imported.
+
+        All tasks are saved with a single write (a new snapshot, or one commit for a query
+        backend) and listeners get a single ('reloaded', None). rows is read as a stream; with
+        a query backend the tasks go straight to the database, so memory use stays bounded.
+        """
+        errors = []
+        error_count = 0
+        skip = on_skip or (lambda number, reason: None)
+
+        def parse(number, row):
+            nonlocal error_count
+            try:
+                return task_from_row(row)
+            except ValueError as e:
+                if skip_invalid:
+                    skip(number, str(e))
+                else:
+                    error_count += 1
+                    if len(errors) < TaskImportError.MAX_REPORTED:
+                        errors.append((number, str(e)))
+                return None
+
+        if not self._resident:
+            imported = 0
+            with self._lock:
+                for number, row in enumerate(rows, 1):
+                    task = parse(number, row)
+                    if task is None or error_count:
+                        continue # After the first error the rest is only validated
+                    if self.storage.insert_new(task):
+                        imported += 1
+                    else:
+                        skip(number, "a task with this id already exists")
+                if error_count:
+                    self.storage.rollback()
+                    raise TaskImportError(errors, error_count)
+                self._save([], None)
+                self._query_cache.invalidate()
+            self._emit('reloaded', None)
+            return imported
+
+        # The stored tasks end up in memory anyway, so the parsed rows are collected first
+        # and only added once all of them are known to be valid
+        parsed = []
+        for number, row in enumerate(rows, 1):
+            task = parse(number, row)
+            if task is not None:
+                parsed.append((number, task))
+        if error_count:
+            raise TaskImportError(errors, error_count)
+
+        self.finish_loading()
+        # No other process can write until the snapshot is on disk, and merging first means it drops nothing
+        with self._lock, self.storage.locked():
+            if self._pending_records:
+                self._flush_pending_writes() # Ours go to disk first, so the merge sees the files in order
+            self._merge_external_changes()
+            archived = self._archived_tasks()
+            imported = 0
+            due_pairs = []
+            for number, task in parsed:
+                if task.id in self.tasks or task.id in archived:
+                    skip(number, "a task with this id already exists")
+                    continue
+                self.tasks[task.id] = task
+                self._index_task(task, due_pairs)
+                imported += 1
+            if due_pairs:
+                self._due_index.extend(due_pairs)
+                self._due_index.sort()
+            self._query_cache.invalidate()
+            if imported:
+                self._save([], self._snapshot, force_snapshot=True)
+                self._emit('reloaded', None)
+        return imported
+
+    @_locked
+    def get_task(self, task_id):
+        """Returns the task with the given ID, or None if there is no such task."""
+        if not self._resident:
+            return self.storage.get(task_id)
+        task = self.tasks.get(task_id)
+        if task is None:
+            task = self._archived_tasks().get(task_id)
+        return task
 
+    def archive_completed(self, now=None):
+        """
+        Moves tasks completed more than archive_after days before now (datetime.now() by default)
+        to the storage's archive and writes a snapshot without them (on the background writer if
+        there is one). Returns the number of tasks moved. Does nothing unless archive_after is set,
+        or while tasks are loading; load_more() has it run once everything is loaded.
+        """
+        moved = self._move_to_archive(now)
+        if moved:
+            self._request_snapshot()
+        return moved
+
+    def _move_to_archive(self, now=None):
+        """Appends the tasks archive_completed() moves to the archive and drops them from memory. Returns how many."""
+        if self.archive_after is None or not self._resident or self.storage.archive is None:
+            return 0
+        cutoff = (now or datetime.datetime.now()) - datetime.timedelta(days=self.archive_after)
+        # Nobody else may write until the tasks are in the archive and out of the snapshot
+        with self._lock, self.storage.locked():
+            if self._loader is not None:
+                return 0
+            if self._pending_records:
+                self._flush_pending_writes() # Ours go to disk first, so the merge sees the files in order
+            self._merge_external_changes() # Don't archive a task another process just changed
+            # Tasks completed before completion times were recorded count from their creation
+            old_tasks = [task for task in self.tasks.values()
+                         if task.completed and (task.completed_at or task.created_at) < cutoff]
+            if not old_tasks:
+                return 0
+            # On disk before they leave the stored tasks; a crash in between leaves a copy in both,
+            # and the stored one wins
+            self.storage.archive.append([task.to_dict() for task in old_tasks])
+            due_removed = set()
+            for task in old_tasks:
+                self._demote(task, due_removed)
+            # One pass over the due-date index instead of one deletion per task
+            self._due_index = [pair for pair in self._due_index if pair[1] not in due_removed]
+        # The caller writes the snapshot without them. Until then they are in both files and the
+        # stored copies win, so another process writing first only means they are archived next time.
+        return len(old_tasks)
+
+    def _archived_tasks(self, required=True):
+        """
+        Returns {task_id: task} of archived tasks, reading the archive the first time. Empty while
+        loading, and while the background writer reads the archive unless required (the caller
+        needs every task, not just a view of them; the archive is then read right here).
+        """
+        if self._archive is not None:
+            return self._archive
+        if not self._resident or self.storage.archive is None or self._loader is not None:
+            return {} # Read once every stored task is loaded, so the stored copies win
+        if self._reading_archive and not required:
+            return {} # Arrive with a 'loaded' event
+        return self._install_archive(self._read_archive())
+
+    def _read_archive(self):
+        """Parses every archived task. Takes only the storage lock, so it may run without ours."""
+        mark = metrics.timer('load_archive')
+        with self.storage.locked():
+            tasks = [Task.from_dict(task_data) for task_data in self.storage.archive.iter_tasks()]
+        mark()
+        metrics.observe('load_archive.count', len(tasks))
+        return tasks
+
+    def _install_archive(self, tasks):
+        archived = {}
+        for task in tasks:
+            if task.id not in self.tasks and task.id not in self._archive_removals:
+                archived[task.id] = task # Later copies replace earlier ones
+        for task_id in archived:
+            self._positions[task_id] = next(self._next_position)
+        self._archive = archived
+        self._archive_generation += 1
+        if self._reading_archive:
+            # Queries so far left the archived tasks out
+            self._reading_archive = False
+            self._query_cache.invalidate()
+            self._emit('loaded', None)
+        return archived
+
+    def _read_archive_in_background(self):
+        """Runs on the background writer thread: reads the archive without holding the lock, then shows it."""
+        with self._lock:
+            if not self._reading_archive:
+                return # Read meanwhile by a caller that needed it
+            generation = self._archive_generation
+        tasks = self._read_archive()
+        with self._lock:
+            if not self._reading_archive or generation != self._archive_generation:
+                return # Read or dropped in the meantime; a dropped archive is read again next round
+            self._install_archive(tasks)
+
+    @_locked
+    def position(self, task):
+        """
+        Returns a value that orders task among tasks with the same sort key the way get_tasks()
+        does: loaded tasks in the order they were added, then archived ones. Views patched
+        through listeners use it to put a changed task where a fresh query would.
+        """
+        if not self._resident:
+            return (False, self.storage.position(task.id))
+        return (task.id not in self.tasks, self._positions.get(task.id, 0))
+
+    def _archived_matching(self, category):
+        archived = self._archived_tasks(required=False).values()
+        if category is None:
+            return list(archived)
+        return [task for task in archived if task.category == category]
+
+    def _filtered_tasks(self, category, include_completed):
+        """The tasks in category (all if None) in insertion order, archived ones last if include_completed."""
+        if category is None:
+            candidates = self.tasks.values()
+        else:
+            candidates = self._category_index.get(category, {}).values()
+        if include_completed:
+            return list(candidates) + self._archived_matching(category)
+        return [task for task in candidates if not task.completed]
+
+    @_locked
     def get_tasks(self, category=None, include_completed=True, sort_by='created_at'):
         """
         Returns tasks, optionally filtered by category, and sorted.
         sort_by can be 'created_at', 'due_date', 'description', 'completed'.
         """
-        filtered_tasks = []
-        for task in self.tasks:
-            if category is None or task.get('category') == category:
-                if include_completed or not task['completed']:
-                    filtered_tasks.append(task)
-
-        # Sorting logic
-        if sort_by == 'created_at':
-            # Sort by creation date (oldest first)
-            filtered_tasks.sort(key=lambda t: datetime.datetime.fromisoformat(t['created_at']))
-        elif sort_by == 'due_date':
-            # Sort by due date (earliest first), None due dates go to the end
-            def sort_key_due_date(task):
-                if task.get('due_date'):
-                    return datetime.datetime.strptime(task['due_date'], '%Y-%m-%d')
-                return datetime.datetime.max # Puts None due dates at the end
-            filtered_tasks.sort(key=sort_key_due_date)
-        elif sort_by == 'description':
-            filtered_tasks.sort(key=lambda t: t['description'].lower())
-        elif sort_by == 'completed':
-            # Completed tasks at the end
-            filtered_tasks.sort(key=lambda t: t['completed'])
-        # Add more sorting options as needed
+        return self._cached(('tasks', category, include_completed, sort_by),
+                            lambda: self._query_tasks(category, include_completed, sort_by))
+
+    def _query_tasks(self, category, include_completed, sort_by):
+        mark = metrics.timer('get_tasks')
+        if not self._resident:
+            tasks = self.storage.query(category, include_completed, sort_by)
+            mark('sql')
+            return tasks
+        if self._columns is not None:
+            return self._query_columns(category, include_completed, sort_by, mark)
+        filtered_tasks = self._filtered_tasks(category, include_completed)
+        mark('filter')
+
+        # Sorting logic, see SORT_KEYS
+        sort_key = SORT_KEYS.get(sort_by)
+        if sort_key is not None:
+            filtered_tasks.sort(key=sort_key)
+        mark('sort')
 
         return filtered_tasks
 
+    def _query_columns(self, category, include_completed, sort_by, mark):
+        filtered_tasks = self._columns.query(category, include_completed, sort_by)
+        mark('columnar')
+        archived = self._archived_matching(category) if include_completed else None
+        if archived:
+            # Archived tasks go after the loaded ones, as in _filtered_tasks(); a stable sort
+            # of the sorted loaded tasks plus them gives the same order as sorting them all
+            filtered_tasks += archived
+            sort_key = SORT_KEYS.get(sort_by)
+            if sort_key is not None:
+                filtered_tasks.sort(key=sort_key)
+            mark('sort')
+        return filtered_tasks
+
+    def iter_tasks(self, category=None, include_completed=True, sort_by='created_at', limit=None, after=None):
+        """
+        Yields tasks filtered like get_tasks(), sorted by sort_by with ties broken by task id,
+        so a list can be read a page at a time without ever building all of it:
+
+            page = list(task_manager.iter_tasks(sort_by='due_date', limit=50))
+            next_page = list(task_manager.iter_tasks(sort_by='due_date', limit=50,
+                                                     after=page_cursor(page[-1], 'due_date')))
+
+        after is a cursor from page_cursor(); only tasks after it are returned. With a limit
+        just the first limit tasks are picked out instead of sorting every match. Results are
+        cached until the next change: the first page as is, and for later pages the whole
+        sorted list, so each further page is a binary search away. A query backend is read
+        QUERY_CHUNK_SIZE rows at a time instead, so e.g. exporting it never holds every task.
+        """
+        if sort_by not in SORT_KEYS:
+            raise ValueError(f"Unknown sort_by '{sort_by}'")
+        if not self._resident:
+            # The backend's connection is shared with writers: reading under the lock never sees
+            # a batch() from another thread before it commits (or after it rolls back)
+            while limit is None or limit > 0:
+                size = QUERY_CHUNK_SIZE if limit is None else min(limit, QUERY_CHUNK_SIZE)
+                with self._lock:
+                    page = list(self.storage.iter_query(category, include_completed, sort_by, size, after))
+                yield from page
+                if len(page) < size:
+                    return
+                if limit is not None:
+                    limit -= size
+                after = page_cursor(page[-1], sort_by)
+            return
+        with self._lock:
+            if after is None and limit is not None:
+                page = self._cached(('first_page', category, include_completed, sort_by, limit),
+                                    lambda: self._pick_tasks(category, include_completed, sort_by, limit, None))
+            elif self._query_cache.max_entries > 0:
+                cursors, ordered = self._ordered_tasks(category, include_completed, sort_by)
+                start = 0 if after is None else bisect.bisect_right(cursors, after)
+                page = ordered[start:] if limit is None else ordered[start:start + limit]
+            else:
+                page = self._pick_tasks(category, include_completed, sort_by, limit, after)
+        yield from page
+
+    def _pick_tasks(self, category, include_completed, sort_by, limit, after):
+        """The matching tasks after after, in iter_tasks() order, found without the cache."""
+        candidates = self._filtered_tasks(category, include_completed)
+        sort_key = SORT_KEYS[sort_by]
+        if after is not None:
+            candidates = [task for task in candidates if (sort_key(task), task.id) > after]
+        if limit is None:
+            # Two stable sorts give (sort key, id) order without building a tuple per task
+            candidates.sort(key=attrgetter('id'))
+            candidates.sort(key=sort_key)
+            page = candidates
+        else:
+            # (sort key, id, task) rows; ids are unique, so comparing rows never reaches the task.
+            # Picking limit rows is O(n log limit) rather than a full sort.
+            rows = zip(map(sort_key, candidates), map(attrgetter('id'), candidates), candidates)
+            page = [row[2] for row in heapq.nsmallest(limit, rows)]
+        return page
+
+    def _ordered_tasks(self, category, include_completed, sort_by):
+        """Returns (cursors, tasks): the matching tasks in iter_tasks() order, and their page cursors."""
+        key = ('ordered', category, include_completed, sort_by)
+        result = self._query_cache.get(key)
+        if result is None:
+            version = self._query_cache.version
+            tasks = self._filtered_tasks(category, include_completed)
+            sort_key = SORT_KEYS[sort_by]
+            tasks.sort(key=attrgetter('id'))
+            tasks.sort(key=sort_key)
+            result = (list(zip(map(sort_key, tasks), map(attrgetter('id'), tasks))), tasks)
+            self._query_cache.put(key, version, result)
+        return result
+
+    @_locked
+    def search(self, query, category=None, include_completed=True, sort_by='created_at'):
+        """
+        Returns tasks whose description has a word starting with each word of query
+        ("gro mil" finds "Buy groceries and milk"), filtered and sorted like get_tasks().
+        An empty query returns the same tasks as get_tasks().
+        """
+        terms = tokenize(query)
+        if not terms:
+            return self.get_tasks(category, include_completed, sort_by)
+        return self._cached(('search', tuple(terms), category, include_completed, sort_by),
+                            lambda: self._search_tasks(terms, category, include_completed, sort_by))
+
+    def _search_tasks(self, terms, category, include_completed, sort_by):
+        if not self._resident:
+            return self.storage.search(terms, category, include_completed, sort_by)
+        if self._search_index is None or self._search_backlog:
+            self.index_for_search()
+        ids = self._search_index.match(terms)
+        # Archived tasks aren't in the search index; they are scanned, and only when completed tasks are asked for
+        archived_found = []
+        if include_completed:
+            archived_found = [task for task in self._archived_matching(category) if matches(terms, task.description)]
+        candidates = self.tasks if category is None else self._category_index.get(category, {})
+        if len(ids) * 8 >= len(candidates):
+            # Many matches: filter the get_tasks() result, usually cached and already in order
+            if archived_found:
+                ids = ids | {task.id for task in archived_found}
+            return [task for task in self.get_tasks(category, include_completed, sort_by) if task.id in ids]
+
+        # Few matches: look them up rather than walking every candidate.
+        # Putting them in insertion order first makes ties come out like in get_tasks().
+        found_tasks = [self.tasks[task_id] for task_id in sorted(ids, key=self._positions.__getitem__)]
+        found_tasks = [task for task in found_tasks
+                       if (category is None or task.category == category) and (include_completed or not task.completed)]
+        found_tasks += archived_found # After the others, like in get_tasks()
+        sort_key = SORT_KEYS.get(sort_by)
+        if sort_key is not None:
+            found_tasks.sort(key=sort_key)
+        return found_tasks
+
+    def index_for_search(self, count=None):
+        """
+        Adds up to count more tasks to the search index (all remaining ones if count is None).
+        Returns True if tasks remain. search() completes the index itself, so this only
+        exists to build it ahead of time in small steps, e.g. while the GUI is idle.
+        """
+        if not self._resident:
+            return False
+        with self._lock:
+            if self._search_index is None:
+                # Tasks loaded from now on are indexed as they arrive
+                self._search_index = SearchIndex()
+                self._search_backlog = list(self.tasks)
+            backlog = self._search_backlog
+            start = 0 if count is None else max(0, len(backlog) - count)
+            for task_id in backlog[start:]:
+                task = self.tasks.get(task_id)
+                if task is not None: # Skip tasks deleted in the meantime
+                    self._search_index.add(task_id, task.description)
+            del backlog[start:]
+            return bool(backlog)
+
+    @_locked
     def get_categories(self):
-        """Returns a list of all unique categories."""
-        categories = set()
-        for task in self.tasks:
-            categories.add(task.get('category', 'Uncategorized'))
-        return sorted(list(categories))
+        """Returns a list of all unique categories. Those of archived tasks are included once the archive was read."""
+        if not self._resident:
+            return self._cached(('categories',), self.storage.categories)
+        if self._archive:
+            return self._cached(('categories',), lambda: sorted(
+                set(self._categories).union(task.category for task in self._archive.values())))
+        return list(self._categories) # Already kept sorted, nothing to cache
+
+    def _cached(self, key, query):
+        """Returns a copy of query()'s result, reusing the cached one if nothing changed since."""
+        result = self._query_cache.get(key)
+        if result is None:
+            version = self._query_cache.version
+            result = query()
+            self._query_cache.put(key, version, result)
+        return list(result) # Callers may modify the list they get
+
+    @_locked
+    def cache_stats(self):
+        """Returns query cache counters: {'hits', 'misses', 'entries', 'version'}."""
+        return self._query_cache.stats()
+
+    @_locked
+    def get_category_counts(self, include_completed=True):
+        """Returns {category: number of tasks}, counting only incomplete tasks if include_completed is False."""
+        if not self._resident:
+            return self.storage.category_counts(include_completed)
+        if include_completed:
+            counts = {category: len(bucket) for category, bucket in self._category_index.items()}
+            for task in self._archived_tasks(required=False).values():
+                counts[task.category] = counts.get(task.category, 0) + 1
+            return counts
+        return dict(self._open_counts)
+
+    def _due_date_state(self, due_date):
+        if due_date < self.today:
+            return 'overdue'
+        if due_date < self._soon_end:
+            return 'due_soon'
+        return None
+
+    def _count_due_state(self, due_date, delta):
+        state = self._due_date_state(due_date)
+        if state is not None:
+            self._due_counts[state] += delta
+
+    def due_state(self, task):
+        """Returns 'overdue', 'due_soon' or None for task as of self.today. Completed tasks are neither."""
+        if task.completed or not task.due_date:
+            return None
+        return self._due_date_state(task.due_date)
+
+    @_locked
+    def overdue_count(self):
+        """Number of incomplete overdue tasks. Kept up to date by every change instead of counted."""
+        if not self._resident:
+            return self.storage.count_due_between(None, self.today) # A range of the due_date index
+        return self._due_counts['overdue']
+
+    @_locked
+    def due_soon_count(self):
+        """Number of incomplete tasks due soon (see due_soon_days)."""
+        if not self._resident:
+            return self.storage.count_due_between(self.today, self._soon_end)
+        return self._due_counts['due_soon']
+
+    def _open_tasks_due_between(self, start, end):
+        if not self._resident:
+            return self.storage.due_between(start, end)
+        first = bisect.bisect_left(self._due_index, (start,))
+        last = bisect.bisect_left(self._due_index, (end,), first)
+        tasks = (self.tasks[task_id] for _, task_id in self._due_index[first:last])
+        return [task for task in tasks if not task.completed]
+
+    def _first_due_date(self, day):
+        # The earliest due date on or after day; with the in-memory index completed tasks count too,
+        # which at worst wakes the caller up once for nothing
+        if not self._resident:
+            return self.storage.next_due_date(day)
+        index = bisect.bisect_left(self._due_index, (day,))
+        return self._due_index[index][0] if index < len(self._due_index) else None
+
+    @_locked
+    def next_due_change(self):
+        """
+        Returns the next day on which a task becomes due soon or overdue, or None if none will,
+        so a caller can sleep until then and call advance_due_dates(). Costs a binary search.
+        """
+        # A task due on day d is due soon from d - due_soon_days + 1 and overdue from d + 1
+        days = []
+        first_due = self._first_due_date(self.today)
+        if first_due is not None:
+            days.append(first_due + datetime.timedelta(days=1))
+        first_not_soon = self._first_due_date(self._soon_end)
+        if first_not_soon is not None:
+            days.append(first_not_soon - datetime.timedelta(days=self.due_soon_days - 1))
+        return min(days, default=None)
+
+    def advance_due_dates(self, today=None):
+        """
+        Moves self.today on to today (date.today() by default) and sends an 'overdue' or
+        'due_soon' event for each task whose due state changed. Only tasks due in the days that
+        passed are looked at, not the whole list. Returns the number of tasks that changed.
+        """
+        today = today or datetime.date.today()
+        if today == self.today:
+            return 0
+        span = datetime.timedelta(days=self.due_soon_days)
+        low, high = sorted((self.today, today)) # The clock may also have been set back
+        changes = []
+        with self._lock:
+            # Only tasks due in these two ranges cross the overdue or the due-soon boundary
+            affected = {}
+            for start, end in ((low, high), (low + span, high + span)):
+                for task in self._open_tasks_due_between(start, end):
+                    affected[task.id] = (task, self.due_state(task))
+            self.today = today
+            self._soon_end = today + span
+            for task, old_state in affected.values():
+                new_state = self.due_state(task)
+                if new_state != old_state:
+                    if self._resident:
+                        if old_state is not None:
+                            self._due_counts[old_state] -= 1
+                        if new_state is not None:
+                            self._due_counts[new_state] += 1
+                    changes.append((new_state or 'not_due', task))
+        for event_type, task in changes:
+            self._emit(event_type, task)
+        return len(changes)
+
+    @_locked
+    def get_tasks_due_before(self, due_date, include_completed=True):
+        """
+        Returns tasks due strictly before due_date ('YYYY-MM-DD' or a date), earliest first.
+        Tasks without a due date are never included.
+        """
+        if isinstance(due_date, str):
+            due_date = parse_due_date(due_date)
+        elif isinstance(due_date, datetime.datetime):
+            due_date = due_date.date()
+        if not self._resident:
+            return self.storage.due_before(due_date, include_completed)
+        end = bisect.bisect_left(self._due_index, (due_date,))
+        tasks = [self.tasks[task_id] for _, task_id in self._due_index[:end]]
+        if not include_completed:
+            return [task for task in tasks if not task.completed]
+        archived = [task for task in self._archived_tasks(required=False).values()
+                    if task.due_date and task.due_date < due_date]
+        if archived:
+            tasks += archived
+            tasks.sort(key=lambda task: (task.due_date, task.id)) # The due-date index order
+        return tasks
 
 # Example Usage (for testing purposes, if run directly)
 if __name__ == "__main__":
@@ -134,32 +1247,30 @@ if __name__ == "__main__":
 
     print("\n--- All Tasks (Sorted by Creation) ---")
     for task in task_manager.get_tasks():
-        print(f"[{'DONE' if task['completed'] else 'TODO'}] "
-              f"ID: {task['id'][:8]}... | "
-              f"Desc: {task['description']} | "
-              f"Category: {task['category']} | "
-              f"Due: {task['due_date'] if task['due_date'] else 'N/A'} | "
-              f"Created: {task['created_at'].split('T')[0]}")
+        print(f"[{'DONE' if task.completed else 'TODO'}] "
+              f"ID: {task.id[:8]}... | "
+              f"Desc: {task.description} | "
+              f"Category: {task.category} | "
+              f"Due: {task.due_date if task.due_date else 'N/A'} | "
+              f"Created: {task.created_at.strftime('%Y-%m-%d')}")
 
     print("\n--- Tasks in 'Programming' Category ---")
     for task in task_manager.get_tasks(category="Programming"):
-        print(f"[{'DONE' if task['completed'] else 'TODO'}] {task['description']} (Due: {task['due_date']})")
+        print(f"[{'DONE' if task.completed else 'TODO'}] {task.description} (Due: {task.due_date})")
 
     # Get a task ID to test delete/toggle
     task_to_delete_id = None
     task_to_toggle_id = None
     if task_manager.get_tasks():
-        task_to_delete_id = task_manager.get_tasks()[0]['id']
-        task_to_toggle_id = task_manager.get_tasks()[1]['id']
+        task_to_delete_id = task_manager.get_tasks()[0].id
+        task_to_toggle_id = task_manager.get_tasks()[1].id
 
     if task_to_toggle_id:
-        print(f"\n--- Toggling status for: {task_manager.get_tasks(task_id=task_to_toggle_id)[0]['description']} ---")
+        print(f"\n--- Toggling status for: {task_manager.get_task(task_to_toggle_id).description} ---")
         task_manager.toggle_task_status(task_to_toggle_id)
-        # Assuming you'd have a way to fetch specific task by ID if needed,
-        # but for this example, we just show it after reload.
         print("\n--- All Tasks After Toggle ---")
         for task in task_manager.get_tasks():
-            print(f"[{'DONE' if task['completed'] else 'TODO'}] {task['description']} (Category: {task['category']})")
+            print(f"[{'DONE' if task.completed else 'TODO'}] {task.description} (Category: {task.category})")
 
 
     if task_to_delete_id:
@@ -168,10 +1279,10 @@ if __name__ == "__main__":
 
     print("\n--- All Tasks After Deletion (Sorted by Due Date) ---")
     for task in task_manager.get_tasks(sort_by='due_date'):
-        print(f"[{'DONE' if task['completed'] else 'TODO'}] "
-              f"Desc: {task['description']} | "
-              f"Category: {task['category']} | "
-              f"Due: {task['due_date'] if task['due_date'] else 'N/A'}")
+        print(f"[{'DONE' if task.completed else 'TODO'}] "
+              f"Desc: {task.description} | "
+              f"Category: {task.category} | "
+              f"Due: {task.due_date if task.due_date else 'N/A'}")
 
     print("\n--- Available Categories ---")
     print(task_manager.get_categories())
\ No newline at end of file
@@ -0,0 +1,98 @@
+# test_archive.py
+import datetime
+import json
+import os
+import sys
+import tempfile
+import threading
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from task_manager import TaskManager
+
+LONG_AGO = (datetime.datetime.now() - datetime.timedelta(days=90)).isoformat()
+
+def write_tasks(path, count):
+    """Writes count tasks; the even ones were completed long ago, so archive_after=30 archives them."""
+    with open(path, 'w') as f:
+        json.dump([{"id": f"t{i}", "description": f"Task {i}", "completed": i % 2 == 0, "created_at": LONG_AGO,
+                    "category": "Work", "due_date": None, "completed_at": LONG_AGO if i % 2 == 0 else None}
+                   for i in range(count)], f)
+
+def stored_ids(path):
+    with open(path) as f:
+        return {task["id"] for task in json.load(f)}
+
+class ArchiveTestCase(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "tasks.json")
+        write_tasks(self.path, 10)
+
+    def open(self, **options):
+        task_manager = TaskManager(self.path, journal=True, archive_after=30, **options)
+        self.addCleanup(task_manager.close)
+        return task_manager
+
+class BackgroundArchiveTest(ArchiveTestCase):
+    def test_loading_leaves_archiving_to_the_background_writer(self):
+        task_manager = self.open(lazy=True, write_behind=True, write_delay=60)
+        events = []
+        task_manager.add_listener(lambda event_type, task: events.append((event_type, threading.current_thread())))
+        task_manager.finish_loading()
+        # Nothing was archived or written on this thread
+        self.assertEqual(len(task_manager.tasks), 10)
+        self.assertFalse(os.path.exists(self.path + ".archive.gz"))
+
+        self.assertTrue(task_manager.flush(10))
+        self.assertEqual(sorted(task_manager.tasks), ["t1", "t3", "t5", "t7", "t9"])
+        self.assertEqual(stored_ids(self.path), set(task_manager.tasks))
+        self.assertEqual(len(task_manager.get_tasks()), 10)
+        self.assertIn('loaded', [event_type for event_type, thread in events if thread is not threading.current_thread()])
+
+    def test_queries_leave_archived_tasks_out_until_the_archive_is_read(self):
+        self.open().close() # Archives the even tasks right away: no background writer
+        task_manager = self.open(lazy=True, write_behind=True, write_delay=60)
+        task_manager.finish_loading()
+        self.assertEqual(len(task_manager.get_tasks()), 5)
+        self.assertEqual(task_manager.get_task("t4").description, "Task 4") # Needs it, so reads it now
+        self.assertEqual(len(task_manager.get_tasks()), 10)
+
+class PromotionTest(ArchiveTestCase):
+    def test_reopening_an_archived_task_moves_it_back(self):
+        task_manager = self.open()
+        self.assertNotIn("t4", task_manager.tasks)
+        self.assertTrue(task_manager.toggle_task_status("t4"))
+        self.assertFalse(task_manager.get_task("t4").completed)
+        task_manager.close()
+
+        task_manager = self.open()
+        self.assertIn("t4", task_manager.tasks)
+        archived_ids = {task["id"] for task in task_manager.storage.archive.iter_tasks()}
+        self.assertEqual(archived_ids, {"t0", "t2", "t6", "t8"}) # Dropped from the file, not just skipped
+        self.assertEqual(len(task_manager.get_tasks()), 10)
+
+    def test_failed_batch_puts_tasks_back_in_the_archive(self):
+        task_manager = self.open()
+        before = [task.to_dict() for task in task_manager.get_tasks()]
+        with self.assertRaises(RuntimeError):
+            with task_manager.batch():
+                task_manager.toggle_task_status("t4") # Moves out of the archive
+                task_manager.delete_task("t6")
+                task_manager.delete_task("t1")
+                raise RuntimeError("rolled back")
+        self.assertNotIn("t4", task_manager.tasks)
+        self.assertTrue(task_manager.get_task("t4").completed)
+        # Tasks put back by a rollback count as added last, so compare them regardless of order
+        self.assertEqual(sorted((task.to_dict() for task in task_manager.get_tasks()), key=lambda task: task["id"]),
+                         sorted(before, key=lambda task: task["id"]))
+        task_manager.close()
+
+        task_manager = self.open()
+        self.assertEqual([task.to_dict() for task in task_manager.get_tasks()], before)
+        self.assertEqual(sorted(task_manager._archived_tasks()), ["t0", "t2", "t4", "t6", "t8"])
+
+if __name__ == "__main__":
+    unittest.main()
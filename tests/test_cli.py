@@ -0,0 +1,41 @@
+# test_cli.py
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import cli
+
+class LimitTest(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "tasks.json")
+        for description in ("Buy milk", "Buy bread", "Call mum"):
+            self.run_cli("add", description)
+
+    def run_cli(self, *argv):
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            status = cli.main(["--file", self.path, *argv])
+        return status, output.getvalue()
+
+    def test_limit_shows_at_most_that_many_tasks(self):
+        self.assertEqual(len(self.run_cli("list", "--limit", "2", "--format", "jsonl")[1].splitlines()), 2)
+        self.assertEqual(len(self.run_cli("query", "buy", "--limit", "1", "--format", "jsonl")[1].splitlines()), 1)
+        self.assertEqual(self.run_cli("list", "--limit", "0", "--format", "jsonl")[1], "")
+
+    def test_negative_limit_is_rejected(self):
+        for command in (["list"], ["query", "buy"]):
+            with self.subTest(command=command[0]), contextlib.redirect_stderr(io.StringIO()) as errors:
+                with self.assertRaises(SystemExit) as raised:
+                    self.run_cli(*command, "--limit", "-1")
+                self.assertEqual(raised.exception.code, 2)
+                self.assertIn("invalid limit '-1'", errors.getvalue())
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,94 @@
+# test_gui.py
+import datetime
+import json
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from gui import TodoAppGUI
+from task_manager import SORT_KEYS, TaskManager
+
+class _Widget:
+    """Stands in for the Tk variables and comboboxes _load_tasks_to_listbox reads."""
+    def __init__(self, value):
+        self.value = value
+
+    def get(self):
+        return self.value
+
+    def set(self, value):
+        self.value = value
+
+    def __setitem__(self, key, value):
+        pass
+
+class _TaskList:
+    """Stands in for VirtualTaskList; the rows are checked through task_id_map instead."""
+    def set_rows(self, count, row_provider):
+        pass
+
+    def insert_row(self, index):
+        pass
+
+    def delete_row(self, index):
+        pass
+
+    def update_row(self, index):
+        pass
+
+def headless_view(task_manager, sort_label, include_completed=True):
+    """A TodoAppGUI without Tk whose rows are patched from task_manager's events."""
+    app = TodoAppGUI.__new__(TodoAppGUI)
+    app.task_manager = task_manager
+    app.category_filter_combobox = _Widget("All")
+    app.sort_by_combobox = _Widget(sort_label)
+    app.include_completed_var = _Widget(include_completed)
+    app.search_var = _Widget("")
+    app.task_listbox = _TaskList()
+    app._load_tasks_to_listbox()
+
+    def on_change(event_type, task):
+        if event_type == 'added':
+            app._insert_row(task)
+        elif event_type == 'removed':
+            app._remove_row(task, SORT_KEYS[app.view_sort_by](task))
+        elif event_type == 'updated':
+            app._update_row(task)
+    task_manager.add_listener(on_change)
+    return app
+
+class PatchedRowsTest(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "tasks.json")
+
+    def assert_matches_fresh_query(self, app):
+        patched = list(app.task_id_map)
+        app._load_tasks_to_listbox()
+        self.assertEqual(patched, app.task_id_map)
+
+    def test_reopened_archived_task_moves_among_equal_keys(self):
+        long_ago = (datetime.datetime.now() - datetime.timedelta(days=90)).isoformat()
+        with open(self.path, 'w') as f:
+            json.dump([{"id": f"t{i}", "description": "Same", "completed": i >= 3, "created_at": long_ago,
+                        "completed_at": long_ago if i >= 3 else None, "category": "Work",
+                        "due_date": "2025-01-01"} for i in range(6)], f)
+        task_manager = TaskManager(self.path, journal=True, archive_after=30)
+        self.addCleanup(task_manager.close)
+        self.assertEqual(list(task_manager.tasks), ["t0", "t1", "t2"])
+        views = [headless_view(task_manager, label, include_completed)
+                 for label in TodoAppGUI.SORT_BY_MAPPING for include_completed in (True, False)]
+        task_manager.toggle_task_status("t5")
+        task_manager.toggle_task_status("t3")
+        for app in views:
+            with self.subTest(sort_by=app.view_sort_by, include_completed=app.view_include_completed):
+                self.assert_matches_fresh_query(app)
+        due_date_view = views[[app.view_sort_by for app in views].index('due_date')]
+        self.assertEqual(due_date_view.task_id_map, ["t0", "t1", "t2", "t5", "t3", "t4"])
+
+if __name__ == "__main__":
+    unittest.main()
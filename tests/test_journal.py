@@ -0,0 +1,112 @@
+# test_journal.py
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from journal import TaskJournal
+from storage import JSONFileStorage
+from task_manager import TaskManager
+
+def windows_open(file, mode='r', *args, **kwargs):
+    """open() as on Windows, where text files are written with CRLF line endings."""
+    if 'b' not in mode:
+        kwargs.setdefault('newline', '\r\n')
+    return open(file, mode, *args, **kwargs)
+
+class JournalTestCase(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "tasks.json")
+
+class TaskJournalTest(JournalTestCase):
+    def setUp(self):
+        super().setUp()
+        self.journal = TaskJournal(self.path + ".journal")
+        self.addCleanup(self.journal.close)
+
+    def test_size_counts_the_bytes_on_disk_with_windows_line_endings(self):
+        with mock.patch('journal.open', windows_open, create=True):
+            self.journal.append_many([{"op": "delete", "id": "a"}, {"op": "delete", "id": "é"}])
+            self.journal.append({"op": "delete", "id": "b"})
+        self.assertEqual(self.journal.size, os.path.getsize(self.journal.path))
+        records, end = self.journal.records_from(0)
+        self.assertEqual([record["id"] for record in records], ["a", "é", "b"])
+        self.assertEqual(end, self.journal.size)
+
+    def test_records_from_stops_before_a_torn_record(self):
+        self.journal.append({"op": "delete", "id": "a"})
+        offset = self.journal.size
+        with open(self.journal.path, 'ab') as f:
+            f.write(b'{"op":"delete","id":"b"}\n{"op":"del')
+        records, end = self.journal.records_from(offset)
+        self.assertEqual(records, [{"op": "delete", "id": "b"}])
+        # The torn record is read once another process finishes writing it
+        with open(self.journal.path, 'ab') as f:
+            f.write(b'ete","id":"c"}\n')
+        records, end = self.journal.records_from(end)
+        self.assertEqual(records, [{"op": "delete", "id": "c"}])
+        self.assertEqual(end, os.path.getsize(self.journal.path))
+
+    def test_replay_truncates_a_torn_tail(self):
+        self.journal.append({"op": "delete", "id": "a"})
+        self.journal.close()
+        size = os.path.getsize(self.journal.path)
+        with open(self.journal.path, 'ab') as f:
+            f.write(b'{"op":"delete","id":"b"')
+        with mock.patch('builtins.print'): # The warning about the discarded bytes
+            self.assertEqual(self.journal.replay(), [{"op": "delete", "id": "a"}])
+        self.assertEqual(os.path.getsize(self.journal.path), size)
+        self.journal.append({"op": "delete", "id": "c"})
+        self.assertEqual([record["id"] for record in self.journal.replay()], ["a", "c"])
+
+class MergeExternalChangesTest(JournalTestCase):
+    def open(self, compact_threshold=1 << 20):
+        task_manager = TaskManager(storage=JSONFileStorage(self.path, journal=True, compact_threshold=compact_threshold))
+        self.addCleanup(task_manager.close)
+        return task_manager
+
+    def assert_same_tasks(self, first, second):
+        self.assertEqual([task.to_dict() for task in first.get_tasks()], [task.to_dict() for task in second.get_tasks()])
+
+    def test_instances_pick_up_each_others_journal_records(self):
+        first, second = self.open(), self.open()
+        task_id = first.add_task("Written by the first")
+        self.assertTrue(second.merge_external_changes())
+        self.assertEqual(second.get_task(task_id).description, "Written by the first")
+        self.assertFalse(second.merge_external_changes()) # Nothing new since
+
+        second.toggle_task_status(task_id)
+        second.add_task("Written by the second")
+        self.assertTrue(first.merge_external_changes())
+        self.assertTrue(first.get_task(task_id).completed)
+        self.assert_same_tasks(first, second)
+        # Its own records aren't applied a second time
+        self.assertFalse(second.merge_external_changes())
+
+    def test_instances_merge_across_compactions(self):
+        first, second = self.open(compact_threshold=200), self.open(compact_threshold=200)
+        for round_number in range(5):
+            first.add_task(f"First {round_number}")
+            second.merge_external_changes()
+            second.add_task(f"Second {round_number}")
+            first.merge_external_changes()
+        self.assertEqual(len(first.get_tasks()), 10)
+        self.assert_same_tasks(first, second)
+        self.assert_same_tasks(first, self.open())
+        self.assertLess(os.path.getsize(self.path + ".journal"), 400) # Compacted along the way
+
+    def test_instances_pick_up_records_with_windows_line_endings(self):
+        with mock.patch('journal.open', windows_open, create=True):
+            self.test_instances_pick_up_each_others_journal_records()
+
+    def test_instances_compact_with_windows_line_endings(self):
+        with mock.patch('journal.open', windows_open, create=True):
+            self.test_instances_merge_across_compactions()
+
+if __name__ == "__main__":
+    unittest.main()
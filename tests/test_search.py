@@ -0,0 +1,69 @@
+# test_search.py
+import os
+import sqlite3
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from search_index import matches, tokenize
+from storage import SQLiteStorage
+from task_manager import TaskManager
+
+DESCRIPTIONS = ["Café with Zoë", "cafe run", "Naïve plan", "naive plan", "Übung", "uber ride", "Buy groceries"]
+QUERIES = ["cafe", "café", "caf", "zoe", "zoë", "naive", "naïve", "über", "uber", "ub", "gro", "CAFÉ"]
+
+class SearchParityTest(unittest.TestCase):
+    """search() finds the same tasks whichever backend keeps them, and the same ones matches() accepts."""
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+
+    def open_managers(self):
+        managers = [TaskManager(os.path.join(self.directory, "tasks.json")),
+                    TaskManager(storage=SQLiteStorage(os.path.join(self.directory, "tasks.db")))]
+        for task_manager in managers:
+            self.addCleanup(task_manager.close)
+        return managers
+
+    def found(self, task_manager, query):
+        return sorted(task.description for task in task_manager.search(query))
+
+    def test_backends_agree_on_diacritics(self):
+        managers = self.open_managers()
+        for task_manager in managers:
+            for description in DESCRIPTIONS:
+                task_manager.add_task(description)
+        for query in QUERIES:
+            with self.subTest(query=query):
+                expected = sorted(text for text in DESCRIPTIONS if matches(tokenize(query), text))
+                for task_manager in managers:
+                    self.assertEqual(self.found(task_manager, query), expected)
+        self.assertEqual(self.found(managers[1], "cafe"), ["cafe run"])
+
+    def test_database_indexed_with_the_old_tokenizer_is_reindexed(self):
+        path = os.path.join(self.directory, "tasks.db")
+        storage = SQLiteStorage(path)
+        task_manager = TaskManager(storage=storage)
+        for description in DESCRIPTIONS:
+            task_manager.add_task(description)
+        task_manager.close()
+        connection = sqlite3.connect(path)
+        # The index as created before diacritics were kept
+        connection.executescript("""
+            DROP TABLE tasks_fts;
+            CREATE VIRTUAL TABLE tasks_fts USING fts5(description, content='tasks', content_rowid='seq');
+            INSERT INTO tasks_fts (tasks_fts) VALUES ('rebuild');
+        """)
+        self.assertEqual(len(connection.execute("SELECT rowid FROM tasks_fts WHERE tasks_fts MATCH 'cafe'").fetchall()), 2)
+        connection.close()
+
+        task_manager = TaskManager(storage=SQLiteStorage(path))
+        self.addCleanup(task_manager.close)
+        self.assertEqual(self.found(task_manager, "cafe"), ["cafe run"])
+        self.assertEqual(self.found(task_manager, "café"), ["Café with Zoë"])
+
+if __name__ == "__main__":
+    unittest.main()
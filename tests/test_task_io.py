@@ -0,0 +1,40 @@
+# test_task_io.py
+import datetime
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from task_io import task_from_row
+from task_manager import TaskManager
+
+class TaskFromRowTest(unittest.TestCase):
+    def test_offset_timestamps_become_naive_local_time(self):
+        task = task_from_row({"description": "Imported", "completed": True,
+                              "created_at": "2025-01-01T00:00:00+02:00",
+                              "completed_at": "2025-01-02T12:00:00Z"})
+        self.assertIsNone(task.created_at.tzinfo)
+        self.assertIsNone(task.completed_at.tzinfo)
+        expected = datetime.datetime(2024, 12, 31, 22, tzinfo=datetime.timezone.utc).astimezone()
+        self.assertEqual(task.created_at, expected.replace(tzinfo=None))
+
+    def test_invalid_timestamp_is_rejected(self):
+        with self.assertRaises(ValueError):
+            task_from_row({"description": "Imported", "created_at": "yesterday"})
+
+    def test_imported_offset_timestamp_sorts_with_local_ones(self):
+        with tempfile.TemporaryDirectory() as directory:
+            task_manager = TaskManager(os.path.join(directory, "tasks.json"))
+            task_manager.add_task("Local")
+            task_manager.import_tasks([{"description": "Imported", "created_at": "2025-01-01T00:00:00+02:00"}])
+            task_manager.close()
+
+            task_manager = TaskManager(os.path.join(directory, "tasks.json"))
+            descriptions = [task.description for task in task_manager.get_tasks(sort_by='created_at')]
+            task_manager.close()
+        self.assertEqual(descriptions, ["Imported", "Local"])
+
+if __name__ == "__main__":
+    unittest.main()